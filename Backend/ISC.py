@@ -11,7 +11,7 @@ from sklearn.model_selection import TimeSeriesSplit, cross_val_score
 from sklearn.preprocessing import StandardScaler, RobustScaler
 import matplotlib.pyplot as plt
 import joblib
-from scipy import stats
+from joblib import Parallel, delayed, effective_n_jobs
 import seaborn as sns
 
 # Sentiment analysis
@@ -28,7 +28,15 @@ try:
 except ImportError:
     yf = None
 
+import hashlib
+import json
 import os
+import re
+import threading
+from functools import lru_cache
+
+import data_store
+from model_store import ModelStore
 
 # Configuration
 class Config:
@@ -36,10 +44,12 @@ class Config:
     MARKET_CSV = "market.csv"
     SENTIMENT_CSV = "sentiment.csv" 
     EARNINGS_CSV = "earnings.csv"
+    DATA_STORE_DIR = "data_store"       # Parquet copy of the CSVs by ticker/year (python data_store.py)
     
     # Strategy parameters
     TARGET_TICKER = "AAPL"
-    MODEL_OUTPUT = "enhanced_rf_model.joblib"
+    MODEL_OUTPUT = "enhanced_rf_model.joblib"  # File name inside each model store version
+    MODEL_DIR = None                    # Model store root (None = Backend/cache/models)
     
     # Improved thresholds
     PRED_RETURN_BUY_THRESHOLD = 0.003   # 0.3% threshold
@@ -51,6 +61,44 @@ class Config:
     MAX_POSITION_SIZE = 0.1             # Max 10% of portfolio per trade
     STOP_LOSS_PCT = 0.05                # 5% stop loss
     TAKE_PROFIT_PCT = 0.10              # 10% take profit
+    MAX_GROSS_EXPOSURE = 1.0            # Cap on sum of |weights| across names (portfolio backtest)
+    
+    # Feature engineering
+    TREND_WINDOWS = [5, 10]             # Rolling OLS slope windows (trend_<w> features)
+    SENTIMENT_CACHE_SIZE = 100000       # Memoized headline scores (LRU)
+    SENTIMENT_WORKERS = 1               # >1 scores large feeds on a process pool
+    SENTIMENT_CHUNK_SIZE = 50000        # Headlines per parallel shard
+    
+    # Model training
+    CV_SPLITS = 5                       # TimeSeriesSplit folds
+    CV_N_JOBS = -1                      # Folds trained in parallel (-1 = all cores)
+    CV_CACHE_DIR = "cv_cache"           # Fitted fold models by fingerprint (None disables)
+    
+    # Walk-forward evaluation
+    WF_TRAIN_WINDOW = 756               # Rows per training window (0 = all earlier rows)
+    WF_MIN_TRAIN = 252                  # Rows before the first retrain
+    WF_RETRAIN_EVERY = 63               # Rows scored by each model before retraining
+    WF_WARM_START_TREES = 50            # RF/GB trees added per retrain in warm-start mode
+    WF_WARM_START_MAX_TREES = 600       # Most trees a warm-started RF/GB model may hold
+
+class RunConfig:
+    """Copy of Config with per-run overrides.
+    
+    A plain instance rather than a subclass, so it pickles to worker
+    processes; pass it wherever a config is taken (EnhancedStrategy,
+    enhanced_backtest).
+    """
+    def __init__(self, base=Config, **overrides):
+        for name in dir(base):
+            if name.isupper():
+                setattr(self, name, getattr(base, name))
+        for name, value in overrides.items():
+            if not hasattr(self, name):
+                raise ValueError(f"Unknown config setting: {name}")
+            setattr(self, name, value)
+    
+    def __repr__(self):
+        return f"RunConfig({vars(self)})"
 
 # Enhanced data generation (same as original but with better seed control)
 def generate_simulated_market_data(ticker, start_date='2020-01-01', end_date='2024-01-01'):
@@ -188,132 +236,318 @@ def generate_simulated_earnings_data(ticker, start_date='2020-01-01', end_date='
     })
     return df
 
-# Enhanced technical indicators
-def compute_enhanced_technical_indicators(df):
-    """Compute comprehensive technical indicators"""
-    df = df.copy()
-    df['return'] = df['close'].pct_change()
-    df['log_return'] = np.log(df['close'] / df['close'].shift(1))
+def rolling_slope(values, window):
+    """Rolling OLS slope of ``values`` against 0..window-1, fully vectorized.
+
+    Same result as ``stats.linregress(range(window), x)[0]`` on each window:
+    slope = sum((k - k_mean) * y_k) / sum((k - k_mean)^2). The numerator is a
+    rolling sum of x*y with x centered, computed with one convolution, which
+    avoids the cancellation of the sum(x*y) - k_mean*sum(y) form. Windows that
+    are incomplete or contain NaN give NaN. 2-D input (a date x ticker frame)
+    is handled column by column in the same pass.
+    """
+    index = values.index if isinstance(values, (pd.Series, pd.DataFrame)) else None
+    columns = values.columns if isinstance(values, pd.DataFrame) else None
+    y = np.asarray(values, dtype=np.float64)
+    slope = np.full(y.shape, np.nan)
+    if window >= 2 and len(y) >= window:
+        x = np.arange(window) - (window - 1) / 2.0
+        if y.ndim == 1:
+            # np.convolve flips the kernel, so pass it reversed
+            numerator = np.convolve(y, x[::-1], mode='valid')
+        else:
+            numerator = np.lib.stride_tricks.sliding_window_view(y, window, axis=0) @ x
+        slope[window - 1:] = numerator / (x ** 2).sum()
+    if columns is not None:
+        return pd.DataFrame(slope, index=index, columns=columns)
+    return pd.Series(slope, index=index) if index is not None else slope
+
+def technical_indicator_columns(open_, high, low, close, volume, trend_windows=None):
+    """Indicator columns, in output order, from OHLCV series.
+
+    Works unchanged on Series (one ticker) and on date x ticker DataFrames,
+    where every rolling/shift operation runs per column in a single pass.
+    """
+    cols = {}
+    cols['return'] = close.pct_change()
+    cols['log_return'] = np.log(close / close.shift(1))
     
     # Multiple timeframe moving averages
     for window in [5, 10, 20, 50]:
-        df[f'ma_{window}'] = df['close'].rolling(window).mean()
-        df[f'price_to_ma_{window}'] = df['close'] / df[f'ma_{window}'] - 1
+        cols[f'ma_{window}'] = close.rolling(window).mean()
+        cols[f'price_to_ma_{window}'] = close / cols[f'ma_{window}'] - 1
     
     # Volatility indicators
-    df['vol_5'] = df['log_return'].rolling(5).std()
-    df['vol_10'] = df['log_return'].rolling(10).std()
-    df['vol_20'] = df['log_return'].rolling(20).std()
-    df['vol_ratio'] = df['vol_5'] / (df['vol_20'] + 1e-9)
+    cols['vol_5'] = cols['log_return'].rolling(5).std()
+    cols['vol_10'] = cols['log_return'].rolling(10).std()
+    cols['vol_20'] = cols['log_return'].rolling(20).std()
+    cols['vol_ratio'] = cols['vol_5'] / (cols['vol_20'] + 1e-9)
     
     # RSI with multiple periods
     for period in [14, 21]:
-        delta = df['close'].diff()
+        delta = close.diff()
         up = delta.clip(lower=0)
         down = -1 * delta.clip(upper=0)
         ma_up = up.rolling(period).mean()
         ma_down = down.rolling(period).mean()
         rs = ma_up / (ma_down + 1e-9)
-        df[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+        cols[f'rsi_{period}'] = 100 - (100 / (1 + rs))
     
     # Momentum indicators
     for window in [3, 5, 10, 20]:
-        df[f'mom_{window}'] = df['close'] / df['close'].shift(window) - 1
+        cols[f'mom_{window}'] = close / close.shift(window) - 1
     
     # Bollinger Bands
     bb_window = 20
-    bb_std = df['close'].rolling(bb_window).std()
-    bb_mean = df['close'].rolling(bb_window).mean()
-    df['bb_upper'] = bb_mean + 2 * bb_std
-    df['bb_lower'] = bb_mean - 2 * bb_std
-    df['bb_position'] = (df['close'] - bb_mean) / (2 * bb_std)
+    bb_std = close.rolling(bb_window).std()
+    bb_mean = close.rolling(bb_window).mean()
+    cols['bb_upper'] = bb_mean + 2 * bb_std
+    cols['bb_lower'] = bb_mean - 2 * bb_std
+    cols['bb_position'] = (close - bb_mean) / (2 * bb_std)
     
     # Volume indicators
-    df['volume_ma_10'] = df['volume'].rolling(10).mean()
-    df['volume_ratio'] = df['volume'] / (df['volume_ma_10'] + 1)
+    cols['volume_ma_10'] = volume.rolling(10).mean()
+    cols['volume_ratio'] = volume / (cols['volume_ma_10'] + 1)
     
     # Price patterns
-    df['daily_range'] = (df['high'] - df['low']) / df['close']
-    df['gap'] = (df['open'] - df['close'].shift(1)) / df['close'].shift(1)
+    cols['daily_range'] = (high - low) / close
+    cols['gap'] = (open_ - close.shift(1)) / close.shift(1)
     
     # Trend strength
-    df['trend_5'] = df['close'].rolling(5).apply(lambda x: stats.linregress(range(len(x)), x)[0] if len(x) == 5 else np.nan)
-    df['trend_10'] = df['close'].rolling(10).apply(lambda x: stats.linregress(range(len(x)), x)[0] if len(x) == 10 else np.nan)
+    for window in trend_windows or Config.TREND_WINDOWS:
+        cols[f'trend_{window}'] = rolling_slope(close, window)
+    
+    return cols
+
+# Enhanced technical indicators
+def compute_enhanced_technical_indicators(df, trend_windows=None):
+    """Compute comprehensive technical indicators"""
+    df = df.copy()
+    cols = technical_indicator_columns(df['open'], df['high'], df['low'], df['close'],
+                                       df['volume'], trend_windows)
+    for name, values in cols.items():
+        df[name] = values
     
     return df.dropna()
 
+def wide_to_panel(fields):
+    """Long (date, ticker, ...) frame from ``{field: date x ticker DataFrame}``"""
+    long_frames = [
+        frame.rename_axis(index='date', columns='ticker').reset_index()
+             .melt(id_vars='date', var_name='ticker', value_name=name)
+             .set_index(['date', 'ticker'])
+        for name, frame in fields.items()
+    ]
+    panel = pd.concat(long_frames, axis=1).reset_index()
+    # Dates a ticker did not trade are NaN in the wide layout
+    return panel.dropna(subset=['close']).reset_index(drop=True)
+
+def compute_panel_technical_indicators(panel_df, trend_windows=None):
+    """Technical indicators for a whole universe in one vectorized pass.
+
+    ``panel_df`` is a long frame with ``date``, ``ticker`` and OHLCV columns
+    (or a ``{field: date x ticker DataFrame}`` dict). Each ticker's history is
+    laid out as one column of a (row-within-ticker x ticker) matrix, so
+    rolling windows never cross tickers and tickers with different calendars
+    or lengths give exactly what compute_enhanced_technical_indicators gives
+    for each ticker alone. Returns the stacked features sorted by date and
+    ticker, with incomplete rows dropped.
+    """
+    if isinstance(panel_df, dict):
+        panel_df = wide_to_panel(panel_df)
+    p = panel_df.sort_values(['ticker', 'date'], kind='stable').reset_index(drop=True)
+    rows = p.groupby('ticker', sort=False).cumcount().to_numpy()
+    wide = p.assign(_row=rows).pivot(index='_row', columns='ticker',
+                                     values=['open', 'high', 'low', 'close', 'volume'])
+    ticker_codes = wide['close'].columns.get_indexer(p['ticker'])
+    
+    cols = technical_indicator_columns(wide['open'], wide['high'], wide['low'], wide['close'],
+                                       wide['volume'], trend_windows)
+    # Gather every (row, ticker) cell back into the long layout
+    features = pd.DataFrame({name: values.to_numpy()[rows, ticker_codes]
+                             for name, values in cols.items()})
+    p = pd.concat([p, features], axis=1).dropna()
+    return p.sort_values(['date', 'ticker'], kind='stable').reset_index(drop=True)
+
 # Enhanced sentiment analysis
-def compute_enhanced_sentiment(sentiment_df):
-    """Enhanced sentiment scoring with weighted importance"""
-    sid = SentimentIntensityAnalyzer()
-    
-    def enhanced_sentiment_score(text):
-        if not isinstance(text, str) or text.strip() == "":
-            return {'sentiment': 0.0, 'confidence': 0.0, 'word_count': 0}
-        
-        # Basic VADER score
-        scores = sid.polarity_scores(text)
-        
-        # Weight by text length and key financial terms
-        word_count = len(text.split())
-        financial_terms = ['earnings', 'revenue', 'profit', 'growth', 'margin', 'guidance', 'outlook']
-        financial_weight = sum(1 for term in financial_terms if term.lower() in text.lower())
-        
-        # Confidence based on extremity and relevance
-        confidence = min(abs(scores['compound']) + financial_weight * 0.1, 1.0)
-        
-        return {
-            'sentiment': scores['compound'],
-            'confidence': confidence,
-            'word_count': word_count
-        }
+FINANCIAL_TERMS = ['earnings', 'revenue', 'profit', 'growth', 'margin', 'guidance', 'outlook']
+# One pass finds every term; the lookahead also catches terms overlapping each other
+FINANCIAL_TERMS_RE = re.compile('(?=(' + '|'.join(re.escape(t) for t in FINANCIAL_TERMS) + '))')
+
+_sentiment_analyzer = None
+_sentiment_analyzer_lock = threading.Lock()
+
+def get_sentiment_analyzer():
+    """Shared VADER analyzer (loading the lexicon is the expensive part)"""
+    global _sentiment_analyzer
+    if _sentiment_analyzer is None:
+        with _sentiment_analyzer_lock:
+            if _sentiment_analyzer is None:
+                _sentiment_analyzer = SentimentIntensityAnalyzer()
+    return _sentiment_analyzer
+
+@lru_cache(maxsize=Config.SENTIMENT_CACHE_SIZE)
+def score_text(text):
+    """(sentiment, confidence, word_count) for one headline, memoized by text"""
+    if text.strip() == "":
+        return 0.0, 0.0, 0
+    
+    # Basic VADER score
+    compound = get_sentiment_analyzer().polarity_scores(text)['compound']
+    
+    # Weight by text length and key financial terms
+    word_count = len(text.split())
+    financial_weight = len(set(FINANCIAL_TERMS_RE.findall(text.lower())))
+    
+    # Confidence based on extremity and relevance
+    confidence = min(abs(compound) + financial_weight * 0.1, 1.0)
+    return compound, confidence, word_count
+
+def score_texts(texts):
+    """Score a column of texts, running VADER once per distinct text"""
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+    unique_scores = np.array(
+        [score_text(t) if isinstance(t, str) else (0.0, 0.0, 0) for t in uniques] + [(0.0, 0.0, 0)],
+        dtype=np.float64
+    ).reshape(-1, 3)
+    # NaN texts get code -1, which picks the trailing all-zero row
+    scores = unique_scores[codes]
+    return scores[:, 0], scores[:, 1], scores[:, 2].astype(np.int64)
+
+def _score_and_aggregate(shard):
+    shard = shard.copy()
+    shard['sentiment'], shard['confidence'], shard['word_count'] = score_texts(shard['text'])
+    return aggregate_daily_sentiment(shard)
+
+def _init_sentiment_worker():
+    # Load the VADER lexicon once per worker rather than once per shard
+    get_sentiment_analyzer()
+
+def shard_by_group(s, chunk_size):
+    """Split rows into shards of about ``chunk_size`` rows without splitting a (date, ticker) group.
+    
+    Shards cover consecutive groups in sorted order and keep rows in their
+    original order, so concatenating the shards' aggregates in shard order
+    gives exactly the serial result. Rows without a date or ticker belong to
+    no group and are left out, as the serial aggregation drops them too.
+    """
+    s = s.dropna(subset=['date', 'ticker'])
+    if len(s) == 0:
+        return []
+    group_ids = s.groupby(['date', 'ticker']).ngroup().to_numpy()
+    counts = np.bincount(group_ids)
+    group_shard = (np.cumsum(counts) - counts) // chunk_size
+    row_shard = group_shard[group_ids]
+    order = np.argsort(row_shard, kind='stable')
+    bounds = np.flatnonzero(np.diff(row_shard[order])) + 1
+    return [s.iloc[rows] for rows in np.split(order, bounds)]
+
+def compute_enhanced_sentiment(sentiment_df, workers=None, chunk_size=None):
+    """Enhanced sentiment scoring with weighted importance
     
+    With ``workers`` > 1 (default Config.SENTIMENT_WORKERS) feeds larger than
+    ``chunk_size`` headlines are sharded by (date, ticker) group and scored on
+    a process pool of spawned workers; the output is identical to the serial path.
+    """
     if sentiment_df is None or len(sentiment_df) == 0:
         return pd.DataFrame(columns=['date', 'ticker', 'sentiment', 'confidence'])
     
-    s = sentiment_df.copy()
+    workers = workers or Config.SENTIMENT_WORKERS
+    chunk_size = chunk_size or Config.SENTIMENT_CHUNK_SIZE
+    
+    s = sentiment_df[['date', 'ticker', 'text']].copy()
     s['date'] = pd.to_datetime(s['date']).dt.date
     
-    # Apply enhanced scoring
-    sentiment_scores = s['text'].apply(enhanced_sentiment_score)
-    s['sentiment'] = [score['sentiment'] for score in sentiment_scores]
-    s['confidence'] = [score['confidence'] for score in sentiment_scores]
-    s['word_count'] = [score['word_count'] for score in sentiment_scores]
-    
-    # Aggregate daily with confidence weighting
-    def weighted_sentiment(group):
-        if len(group) == 0:
-            return pd.Series({'sentiment': 0.0, 'confidence': 0.0, 'news_count': 0})
-        
-        weights = group['confidence'] + 0.1  # Avoid zero weights
-        weighted_sent = (group['sentiment'] * weights).sum() / weights.sum()
-        avg_confidence = group['confidence'].mean()
-        news_count = len(group)
-        
-        return pd.Series({
-            'sentiment': weighted_sent,
-            'confidence': avg_confidence,
-            'news_count': news_count
-        })
-    
-    daily = s.groupby(['date', 'ticker']).apply(weighted_sentiment).reset_index()
+    if workers <= 1 or len(s) <= chunk_size:
+        return _score_and_aggregate(s)
+    
+    shards = shard_by_group(s, chunk_size)
+    if len(shards) <= 1:
+        return _score_and_aggregate(s)
+    
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    # Spawn rather than fork: this may run in a job thread of the Flask app, and a
+    # forked child can inherit locks held by the parent's other threads
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards)),
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_sentiment_worker) as pool:
+        daily = list(pool.map(_score_and_aggregate, shards))
+    return pd.concat(daily, ignore_index=True)
+
+def _grouped_sum(values, starts, counts):
+    """Sum of each contiguous group, adding in the same order as Series.sum().
+    
+    numpy sums fewer than 8 values left to right, so small groups (almost every
+    (date, ticker) pair) are summed by one vectorized pass per position; the
+    rare larger groups fall back to np.sum so the result stays bit-identical.
+    """
+    sums = np.zeros(len(starts))
+    small = counts < 8
+    for k in range(int(counts[small].max(initial=0))):
+        rows = small & (counts > k)
+        sums[rows] += values[starts[rows] + k]
+    for g in np.flatnonzero(~small):
+        sums[g] = values[starts[g]:starts[g] + counts[g]].sum()
+    return sums
+
+def aggregate_daily_sentiment(scored):
+    """Confidence-weighted daily sentiment per (date, ticker), without per-group Python calls.
+    
+    sentiment = sum(w * sentiment) / sum(w) with w = confidence + 0.1,
+    confidence = mean confidence, news_count = number of headlines. Rows
+    without a date or ticker are dropped, as groupby() does. Output is
+    identical to the previous groupby().apply() implementation.
+    """
+    scored = scored.dropna(subset=['date', 'ticker'])
+    grouped = scored.groupby(['date', 'ticker'])
+    group_ids = grouped.ngroup().to_numpy()
+    # Stable sort keeps each group's rows in their original order
+    order = np.argsort(group_ids, kind='stable')
+    counts = np.bincount(group_ids)
+    starts = np.cumsum(counts) - counts
+    
+    confidence = scored['confidence'].to_numpy(dtype=np.float64)[order]
+    sentiment = scored['sentiment'].to_numpy(dtype=np.float64)[order]
+    weights = confidence + 0.1  # Avoid zero weights
+    
+    daily = grouped.size().index.to_frame(index=False)
+    daily['sentiment'] = (_grouped_sum(sentiment * weights, starts, counts)
+                          / _grouped_sum(weights, starts, counts))
+    daily['confidence'] = _grouped_sum(confidence, starts, counts) / counts
+    daily['news_count'] = counts.astype(np.float64)
     daily['date'] = pd.to_datetime(daily['date'])
     
     return daily
 
 # Enhanced modeling with ensemble
 class EnhancedPredictor:
-    def __init__(self):
+    def __init__(self, rf_n_jobs=None):
         self.models = {
-            'rf': RandomForestRegressor(n_estimators=300, max_depth=10, random_state=42),
+            'rf': RandomForestRegressor(n_estimators=300, max_depth=10, random_state=42,
+                                        n_jobs=rf_n_jobs),
             'gb': GradientBoostingRegressor(n_estimators=200, max_depth=6, random_state=42),
             'ridge': Ridge(alpha=1.0, random_state=42)
         }
         self.scaler = RobustScaler()  # More robust to outliers
         self.feature_importance = None
+        self.feature_cols = None  # Column order the models were trained on
         
-    def fit(self, X, y):
-        X_scaled = self.scaler.fit_transform(X)
+    def hyperparameters(self):
+        """Everything that changes the fitted models (n_jobs only changes speed)"""
+        params = {name: model.get_params() for name, model in self.models.items()}
+        params['rf'].pop('n_jobs', None)
+        params['scaler'] = self.scaler.get_params()
+        params['class'] = type(self).__name__
+        return params
+    
+    def fit(self, X, y, scaler=None):
+        """Fit every model; pass an already fitted ``scaler`` to reuse its statistics"""
+        if scaler is not None:
+            self.scaler = scaler
+            X_scaled = scaler.transform(X)
+        else:
+            X_scaled = self.scaler.fit_transform(X)
         
         # Train individual models
         for name, model in self.models.items():
@@ -322,42 +556,49 @@ class EnhancedPredictor:
         # Store feature importance from random forest
         self.feature_importance = self.models['rf'].feature_importances_
         
-    def predict(self, X):
-        X_scaled = self.scaler.transform(X)
-        
-        # Ensemble prediction (weighted average)
-        predictions = []
-        weights = {'rf': 0.4, 'gb': 0.4, 'ridge': 0.2}  # RF and GB get more weight
-        
-        ensemble_pred = np.zeros(len(X_scaled))
-        for name, model in self.models.items():
-            pred = model.predict(X_scaled)
-            ensemble_pred += weights[name] * pred
-            
-        return ensemble_pred
+    # RF and GB get more weight
+    WEIGHTS = {'rf': 0.4, 'gb': 0.4, 'ridge': 0.2}
     
-    def predict_with_confidence(self, X):
-        """Return prediction with confidence measure"""
+    def predict_components(self, X):
+        """Scale once and run every model once; returns ``{name: predictions}``"""
         X_scaled = self.scaler.transform(X)
-        
-        # Get predictions from all models
-        preds = {}
-        for name, model in self.models.items():
-            preds[name] = model.predict(X_scaled)
-        
-        # Ensemble prediction
-        weights = {'rf': 0.4, 'gb': 0.4, 'ridge': 0.2}
-        ensemble_pred = sum(weights[name] * preds[name] for name in self.models.keys())
+        return {name: model.predict(X_scaled) for name, model in self.models.items()}
+    
+    def combine(self, preds):
+        """Weighted ensemble mean and agreement-based confidence from per-model predictions"""
+        ensemble_pred = np.zeros(len(preds['rf']))
+        for name in self.models:
+            ensemble_pred += self.WEIGHTS[name] * preds[name]
         
         # Confidence based on agreement between models
-        pred_array = np.array(list(preds.values()))
+        pred_array = np.array([preds[name] for name in self.models])
         confidence = 1 / (1 + np.std(pred_array, axis=0))  # High agreement = high confidence
-        
         return ensemble_pred, confidence
+        
+    def predict(self, X):
+        # Ensemble prediction (weighted average)
+        return self.combine(self.predict_components(X))[0]
+    
+    def predict_with_confidence(self, X):
+        """Return prediction with confidence measure"""
+        return self.combine(self.predict_components(X))
 
 def load_or_generate_data(ticker=Config.TARGET_TICKER):
     """Load data or generate if not available"""
     
+    # Converted store: read just this ticker's partitions instead of parsing every CSV,
+    # unless a CSV has changed since it was converted
+    csv_paths = {'market': Config.MARKET_CSV, 'sentiment': Config.SENTIMENT_CSV,
+                 'earnings': Config.EARNINGS_CSV}
+    if all(data_store.is_current(Config.DATA_STORE_DIR, name, csv_path)
+           for name, csv_path in csv_paths.items()):
+        market, sentiment, earnings = (data_store.load_ticker(Config.DATA_STORE_DIR, name, ticker)
+                                       for name in csv_paths)
+        return market, sentiment, earnings
+    if any(data_store.has_dataset(Config.DATA_STORE_DIR, name) for name in csv_paths):
+        print(f"{Config.DATA_STORE_DIR} is out of date with the CSVs, reading the CSVs "
+              f"(rerun python data_store.py to update it)")
+    
     # Market data
     if os.path.exists(Config.MARKET_CSV):
         market = pd.read_csv(Config.MARKET_CSV, parse_dates=['date'])
@@ -387,8 +628,8 @@ def load_or_generate_data(ticker=Config.TARGET_TICKER):
     
     return market, sentiment, earnings
 
-def prepare_enhanced_features(market_df, sentiment_df, earnings_df=None):
-    """Prepare comprehensive feature set"""
+def build_feature_frame(market_df, sentiment_df, earnings_df=None):
+    """Technical, sentiment and earnings features for every bar (no targets, no dropna)"""
     
     # Technical indicators
     m = compute_enhanced_technical_indicators(market_df)
@@ -432,6 +673,12 @@ def prepare_enhanced_features(market_df, sentiment_df, earnings_df=None):
                        how='left', on='date_key')
             m = m.drop(columns=['date_key'])
     
+    return m
+
+def prepare_enhanced_features(market_df, sentiment_df, earnings_df=None):
+    """Prepare comprehensive feature set"""
+    m = build_feature_frame(market_df, sentiment_df, earnings_df)
+    
     # Create target (next day return)
     m['target_next_return'] = m['return'].shift(-1)
     
@@ -441,6 +688,75 @@ def prepare_enhanced_features(market_df, sentiment_df, earnings_df=None):
     
     return m.dropna()
 
+def live_feature_matrix(market_df, sentiment_df, feature_cols, earnings_df=None, center=None):
+    """Feature rows for scoring the latest bars of a ticker, in ``feature_cols`` order.
+
+    Unlike ``prepare_enhanced_features`` the last bar is kept (its next-day
+    return is what we want to predict). Columns the live data cannot provide
+    (e.g. earnings) are filled with ``center`` (the scaler's training medians),
+    which the scaler maps to zero. Returns ``(rows, missing_cols)`` where rows
+    are the bars with every feature available.
+    """
+    m = build_feature_frame(market_df, sentiment_df, earnings_df)
+    missing = [c for c in feature_cols if c not in m.columns]
+    for col in missing:
+        m[col] = np.nan if center is None else center[list(feature_cols).index(col)]
+    m = m.dropna(subset=list(feature_cols))
+    return m.reset_index(drop=True), missing
+
+def training_fingerprint(X, y, predictor):
+    """Hash of the training data and model hyperparameters, used as a fold cache key"""
+    digest = hashlib.sha256()
+    for array in (X, y):
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.dtype.str, array.shape)).encode())
+        digest.update(array.tobytes())
+    digest.update(json.dumps(predictor.hyperparameters(), sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def final_training_fingerprint(features_df, feature_cols):
+    """Fingerprint of the data and settings behind EnhancedStrategy.fit's final model"""
+    split_idx = int(len(features_df) * 0.8)
+    X = features_df[feature_cols].values[:split_idx]
+    y = features_df['target_next_return'].values[:split_idx]
+    digest = hashlib.sha256(training_fingerprint(X, y, EnhancedPredictor()).encode())
+    digest.update(json.dumps(list(feature_cols)).encode())
+    return digest.hexdigest()
+
+def fit_cv_fold(name, X_train, y_train, X_val, y_val, rf_n_jobs=None, cache_dir=None):
+    """Fit (or load from cache) one EnhancedPredictor and score it on the validation slice"""
+    import time
+    predictor = EnhancedPredictor(rf_n_jobs=rf_n_jobs)
+    cache_path = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_path = os.path.join(cache_dir, training_fingerprint(X_train, y_train, predictor) + ".joblib")
+    
+    start = time.perf_counter()
+    cached = cache_path is not None and os.path.exists(cache_path)
+    if cached:
+        predictor = joblib.load(cache_path)
+    else:
+        predictor.fit(X_train, y_train)
+        if cache_path is not None:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            joblib.dump(predictor, tmp_path)
+            os.replace(tmp_path, cache_path)
+    fit_s = time.perf_counter() - start
+    
+    mse = None
+    if X_val is not None:
+        mse = mean_squared_error(y_val, predictor.predict(X_val))
+    return {
+        'name': name,
+        'train_rows': len(X_train),
+        'val_rows': 0 if X_val is None else len(X_val),
+        'mse': mse,
+        'fit_s': fit_s,
+        'cached': cached,
+        'predictor': predictor if X_val is None else None
+    }
+
 # Enhanced strategy with risk management
 class EnhancedStrategy:
     def __init__(self, config=Config):
@@ -454,143 +770,249 @@ class EnhancedStrategy:
         """Train the ensemble model"""
         X = features_df[feature_cols].values
         y = features_df['target_next_return'].values
+        split_idx = int(len(features_df) * 0.8)
         
-        # Time series split for validation
-        tscv = TimeSeriesSplit(n_splits=5)
-        cv_scores = []
+        # Time series split for validation; the folds and the final fit are
+        # independent, so they are trained side by side
+        tscv = TimeSeriesSplit(n_splits=self.config.CV_SPLITS)
+        tasks = [(f"fold {i + 1}", train_idx, val_idx)
+                 for i, (train_idx, val_idx) in enumerate(tscv.split(X))]
+        # A slice (not an index array) keeps X's memory layout, as the serial fit did
+        tasks.append(("final", slice(0, split_idx), None))
         
-        for train_idx, val_idx in tscv.split(X):
-            X_train, X_val = X[train_idx], X[val_idx]
-            y_train, y_val = y[train_idx], y[val_idx]
-            
-            temp_predictor = EnhancedPredictor()
-            temp_predictor.fit(X_train, y_train)
-            pred_val = temp_predictor.predict(X_val)
-            score = mean_squared_error(y_val, pred_val)
-            cv_scores.append(score)
+        workers = min(effective_n_jobs(self.config.CV_N_JOBS), len(tasks))
+        # Split the cores between concurrent folds so the forests don't oversubscribe
+        rf_n_jobs = max(1, (os.cpu_count() or 1) // workers)
+        results = Parallel(n_jobs=workers)(
+            delayed(fit_cv_fold)(name, X[train_idx], y[train_idx],
+                                 None if val_idx is None else X[val_idx],
+                                 None if val_idx is None else y[val_idx],
+                                 rf_n_jobs, self.config.CV_CACHE_DIR)
+            for name, train_idx, val_idx in tasks
+        )
         
-        print(f"Cross-validation RMSE: {np.mean(cv_scores):.6f} (+/- {np.std(cv_scores):.6f})")
+        self.cv_report = [{k: v for k, v in r.items() if k != 'predictor'} for r in results]
+        for r in self.cv_report:
+            score = f", MSE {r['mse']:.6f}" if r['mse'] is not None else ""
+            source = "cached" if r['cached'] else f"trained in {r['fit_s']:.2f}s"
+            print(f"   {r['name']}: {r['train_rows']} train rows{score} ({source})")
         
-        # Fit final model on all training data
-        split_idx = int(len(features_df) * 0.8)
-        X_train = X[:split_idx]
-        y_train = y[:split_idx]
+        cv_scores = [r['mse'] for r in results if r['mse'] is not None]
+        print(f"Cross-validation RMSE: {np.mean(cv_scores):.6f} (+/- {np.std(cv_scores):.6f})")
         
-        self.predictor.fit(X_train, y_train)
+        # Final model fitted on the first 80% of the data
+        self.predictor = results[-1]['predictor']
+        self.predictor.feature_cols = list(feature_cols)
         return split_idx
     
+    def signal_for(self, pred_ret, conf, sentiment, sent_conf=0.5):
+        """Turn one prediction into ``(signal, final_score, position_size)``
+        
+        Scalar reference for ``signal_arrays``.
+        """
+        # Combined score: prediction * model_confidence + sentiment * sentiment_weight * sent_confidence
+        final_score = (pred_ret * conf + 
+                      sentiment * self.config.SENTIMENT_WEIGHT * sent_conf)
+        
+        # Only trade if confidence is high enough
+        if conf < self.config.CONFIDENCE_THRESHOLD:
+            return 'HOLD', final_score, 0.0
+        
+        # Position sizing based on confidence
+        position_size = min(conf * self.config.MAX_POSITION_SIZE, self.config.MAX_POSITION_SIZE)
+        
+        if final_score > self.config.PRED_RETURN_BUY_THRESHOLD:
+            return 'BUY', final_score, position_size
+        elif final_score < self.config.PRED_RETURN_SELL_THRESHOLD:
+            return 'SELL', final_score, -position_size
+        else:
+            return 'HOLD', final_score, 0.0
+    
+    def signal_arrays(self, pred_ret, conf, sentiment, sent_conf=0.5):
+        """Vectorized ``signal_for``: arrays of signals, final scores and position sizes"""
+        pred_ret, conf, sentiment, sent_conf = (np.asarray(a, dtype=np.float64)
+                                                for a in (pred_ret, conf, sentiment, sent_conf))
+        final_score = (pred_ret * conf + 
+                      sentiment * self.config.SENTIMENT_WEIGHT * sent_conf)
+        position_size = np.minimum(conf * self.config.MAX_POSITION_SIZE, self.config.MAX_POSITION_SIZE)
+        
+        # A NaN confidence is not below the threshold, as in signal_for
+        tradable = ~(conf < self.config.CONFIDENCE_THRESHOLD)
+        buy = tradable & (final_score > self.config.PRED_RETURN_BUY_THRESHOLD)
+        sell = tradable & ~buy & (final_score < self.config.PRED_RETURN_SELL_THRESHOLD)
+        signal = np.where(buy, 'BUY', np.where(sell, 'SELL', 'HOLD')).astype(object)
+        position_size = np.where(buy, position_size, np.where(sell, -position_size, 0.0))
+        return signal, final_score, position_size
+    
+    def score(self, X, sentiment, sent_conf=0.5):
+        """Single-pass scoring for backtests and live requests.
+        
+        Scales ``X`` once, runs each model once and applies the signal rules
+        to all rows at once. Returns a dict of equally long arrays:
+        pred_next_return, pred_confidence, model_disagreement, signal,
+        final_score and position_size.
+        """
+        preds = self.predictor.predict_components(X)
+        pred_returns, confidence = self.predictor.combine(preds)
+        signal, final_score, position_size = self.signal_arrays(pred_returns, confidence,
+                                                                sentiment, sent_conf)
+        return {
+            'pred_next_return': pred_returns,
+            'pred_confidence': confidence,
+            'model_disagreement': np.std([preds[name] for name in self.predictor.models], axis=0),
+            'signal': signal,
+            'final_score': final_score,
+            'position_size': position_size,
+        }
+    
     def generate_signals(self, features_df, feature_cols, split_idx):
         """Generate trading signals with confidence"""
         test_df = features_df.iloc[split_idx:].copy()
-        X_test = test_df[feature_cols].values
-        
-        # Get predictions with confidence
-        pred_returns, confidence = self.predictor.predict_with_confidence(X_test)
-        test_df['pred_next_return'] = pred_returns
-        test_df['pred_confidence'] = confidence
-        
-        # Enhanced signal generation
-        def generate_signal(row):
-            pred_ret = row['pred_next_return']
-            sentiment = row['sentiment']
-            conf = row['pred_confidence']
-            sent_conf = row.get('confidence', 0.5)  # sentiment confidence
-            
-            # Combined score: prediction * model_confidence + sentiment * sentiment_weight * sent_confidence
-            final_score = (pred_ret * conf + 
-                          sentiment * self.config.SENTIMENT_WEIGHT * sent_conf)
-            
-            # Only trade if confidence is high enough
-            if conf < self.config.CONFIDENCE_THRESHOLD:
-                return 'HOLD', final_score, 0.0
-            
-            # Position sizing based on confidence
-            position_size = min(conf * self.config.MAX_POSITION_SIZE, self.config.MAX_POSITION_SIZE)
-            
-            if final_score > self.config.PRED_RETURN_BUY_THRESHOLD:
-                return 'BUY', final_score, position_size
-            elif final_score < self.config.PRED_RETURN_SELL_THRESHOLD:
-                return 'SELL', final_score, -position_size
-            else:
-                return 'HOLD', final_score, 0.0
-        
-        signals = test_df.apply(generate_signal, axis=1)
-        test_df['signal'] = [s[0] for s in signals]
-        test_df['final_score'] = [s[1] for s in signals]
-        test_df['position_size'] = [s[2] for s in signals]
+        sent_conf = test_df['confidence'].values if 'confidence' in test_df else 0.5
+        scores = self.score(test_df[feature_cols].values, test_df['sentiment'].values, sent_conf)
+        for col in ['pred_next_return', 'pred_confidence', 'signal', 'final_score', 'position_size']:
+            test_df[col] = scores[col]
         
         return test_df
 
 # Enhanced backtesting with risk management
-def enhanced_backtest(signals_df):
-    """Backtest with proper risk management"""
-    df = signals_df.copy().reset_index(drop=True)
-    
-    # Initialize tracking variables
-    position = 0
-    entry_price = None
-    portfolio_value = 1.0
+SIGNAL_CODES = {'BUY': 1, 'SELL': 2}
+
+def _next_index(mask):
+    """For each i in 0..n, the smallest j >= i with mask[j] (n if none)"""
+    n = len(mask)
+    nxt = np.where(mask, np.arange(n), n)
+    return np.r_[np.minimum.accumulate(nxt[::-1])[::-1], n]
+
+def _first_stop(price, lo, last, entry_price, long, stop_loss, take_profit):
+    """First bar in ``lo..last`` where the stop loss or take profit triggers, or None.
+    
+    Most trades are closed by a signal within a few bars, so the first bars
+    are checked on plain floats; longer trades are scanned with numpy over
+    growing chunks.
+    """
+    for j in range(lo, min(last, lo + 7) + 1):
+        price_change = price.item(j) / entry_price - 1
+        if long and (price_change < -stop_loss or price_change > take_profit):
+            return j
+        if not long and (price_change > stop_loss or price_change < -take_profit):
+            return j
+    lo, chunk = lo + 8, 64
+    while lo <= last:
+        top = min(last + 1, lo + chunk)
+        price_change = price[lo:top] / entry_price - 1
+        if long:
+            hit = (price_change < -stop_loss) | (price_change > take_profit)
+        else:
+            hit = (price_change > stop_loss) | (price_change < -take_profit)
+        k = hit.argmax()
+        if hit[k]:
+            return lo + int(k)
+        lo, chunk = top, chunk * 4
+    return None
+
+def _backtest_events(price, code, size, stop_loss, take_profit):
+    """Walk the position state machine one trade (not one bar) at a time.
+    
+    Returns ``(bars, positions, entry_prices, cash, close_bars)``: the bars
+    where the position changes with the state after that bar, and the bars
+    closed by a stop loss / take profit. A trade ends at the first bar that
+    hits a stop/target or carries the opposite signal.
+    """
+    n = len(price)
+    next_buy = _next_index(code == SIGNAL_CODES['BUY'])
+    next_sell = _next_index(code == SIGNAL_CODES['SELL'])
+    next_any = np.minimum(next_buy, next_sell)
+    # Per-trade lookups go through .item() to work on Python scalars (same
+    # IEEE arithmetic, far less overhead than numpy scalars)
+    buy_code = SIGNAL_CODES['BUY']
+    
+    # (bar, position after it, entry price, cash); bar -1 is the starting state
+    events = [(-1, 0, np.nan, 1.0)]
+    close_bars = []
     cash = 1.0
-    
-    results = []
-    
-    for i, row in df.iterrows():
-        current_price = row['close']
-        next_return = row['target_next_return']
-        signal = row['signal']
-        position_size = row['position_size']
+    i = next_any.item(0)
+    while i < n:
+        position = size.item(i) if code.item(i) == buy_code else -abs(size.item(i))
+        entry_price = price.item(i)
+        events.append((i, position, entry_price, cash))
         
-        # Calculate current portfolio value
-        if position != 0 and entry_price is not None:
-            current_portfolio_value = cash + position * (current_price / entry_price - 1)
-        else:
-            current_portfolio_value = cash
+        if position == 0:
+            # A zero-size trade is flat: the next BUY or SELL re-enters
+            i = next_any.item(i + 1)
+            continue
+        if position != position:
+            break  # NaN size: neither stops nor signals ever close it
         
-        # Risk management: stop loss and take profit
-        if position != 0 and entry_price is not None:
-            price_change = (current_price / entry_price - 1)
-            
-            # Check stop loss or take profit
-            if (position > 0 and price_change < -Config.STOP_LOSS_PCT) or \
-               (position < 0 and price_change > Config.STOP_LOSS_PCT) or \
-               (position > 0 and price_change > Config.TAKE_PROFIT_PCT) or \
-               (position < 0 and price_change < -Config.TAKE_PROFIT_PCT):
-                # Close position
-                cash = current_portfolio_value
-                position = 0
-                entry_price = None
-                signal = 'CLOSE'
-        
-        # Execute new signals
-        if signal == 'BUY' and position <= 0:
-            cash = current_portfolio_value
-            position = position_size
-            entry_price = current_price
-        elif signal == 'SELL' and position >= 0:
-            cash = current_portfolio_value
-            position = -abs(position_size)
-            entry_price = current_price
-        elif signal == 'HOLD' and position != 0:
-            # Keep current position
-            pass
-        
-        # Calculate strategy return for this period
-        if position != 0:
-            strategy_return = position * next_return
-        else:
-            strategy_return = 0.0
+        long = position > 0
+        opposite = (next_sell if long else next_buy).item(i + 1)
+        stop_bar = _first_stop(price, i + 1, min(opposite, n - 1), entry_price, long,
+                               stop_loss, take_profit)
         
-        results.append({
-            'date': row['date'],
-            'signal': signal,
-            'position': position,
-            'strategy_return': strategy_return,
-            'market_return': next_return,
-            'portfolio_value': current_portfolio_value
-        })
-    
-    results_df = pd.DataFrame(results)
-    
+        if stop_bar is not None:
+            cash = cash + position * (price.item(stop_bar) / entry_price - 1)
+            events.append((stop_bar, 0, np.nan, cash))
+            close_bars.append(stop_bar)
+            i = next_any.item(stop_bar + 1)
+        elif opposite < n:
+            # Flip: mark to market, the next loop iteration opens the new side
+            cash = cash + position * (price.item(opposite) / entry_price - 1)
+            i = opposite
+        else:
+            break
+    bars, positions, entries, cash_values = zip(*events)
+    return (np.array(bars), np.array(positions, dtype=object), np.array(entries, dtype=np.float64),
+            np.array(cash_values, dtype=np.float64), np.array(close_bars, dtype=np.int64))
+
+def enhanced_backtest(signals_df, config=Config):
+    """Backtest with proper risk management
+    
+    Same stop loss / take profit / position rules and output as the previous
+    row-by-row iterrows loop, but the loop runs once per trade and every
+    per-bar column is filled in with array operations.
+    """
+    df = signals_df.reset_index(drop=True)
+    price = df['close'].to_numpy(dtype=np.float64)
+    next_return = df['target_next_return'].to_numpy(dtype=np.float64)
+    signal = df['signal'].to_numpy(dtype=object)
+    code = np.zeros(len(df), dtype=np.int8)
+    for name, value in SIGNAL_CODES.items():
+        code[signal == name] = value
+    size = df['position_size'].to_numpy(dtype=np.float64)
+    
+    bars, positions, entries, cash, close_bars = _backtest_events(
+        price, code, size, config.STOP_LOSS_PCT, config.TAKE_PROFIT_PCT)
+    
+    # State after each bar is the last event at or before it; portfolio value
+    # is marked with the state carried in from the previous bar
+    idx = np.arange(len(df))
+    after = np.searchsorted(bars, idx, side='right') - 1
+    before = np.searchsorted(bars, idx, side='left') - 1
+    # Stay int when nothing was ever traded, as the loop's untouched 0 was
+    positions = positions.astype(np.int64 if len(bars) == 1 else np.float64)
+    position = positions[after]
+    held = positions[before]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        marked = cash[before] + held * (price / entries[before] - 1)
+    portfolio_value = np.where(held != 0, marked, cash[before])
+    
+    signal = signal.copy()
+    signal[close_bars] = 'CLOSE'
+    with np.errstate(invalid='ignore'):
+        strategy_return = np.where(position != 0, position * next_return, 0.0)
+    
+    results_df = pd.DataFrame({
+        'date': df['date'].values,
+        'signal': signal,
+        'position': position,
+        'strategy_return': strategy_return,
+        'market_return': next_return,
+        'portfolio_value': portfolio_value
+    })
+    return results_df, backtest_metrics(results_df)
+
+def backtest_metrics(results_df):
+    """Add cumulative return columns to a backtest frame and compute its metrics"""
     # Calculate cumulative returns
     results_df['strategy_cum_return'] = (1 + results_df['strategy_return']).cumprod() - 1
     results_df['market_cum_return'] = (1 + results_df['market_return']).cumprod() - 1
@@ -612,7 +1034,7 @@ def enhanced_backtest(signals_df):
         'avg_loss': strategy_returns[strategy_returns < 0].mean() if (strategy_returns < 0).any() else 0,
     }
     
-    return results_df, metrics
+    return metrics
 
 def calculate_max_drawdown(cum_returns):
     """Calculate maximum drawdown"""
@@ -692,6 +1114,31 @@ def analyze_feature_importance(predictor, feature_names):
     
     return importance_df
 
+def select_feature_cols(features_df):
+    """Numeric feature columns of a prepare_enhanced_features frame"""
+    exclude_cols = ['date', 'ticker', 'open', 'high', 'low', 'close', 'volume', 
+                   'target_next_return', 'target_direction', 'target_strong_move']
+    return [c for c in features_df.columns 
+            if c not in exclude_cols and 
+            features_df[c].dtype in [float, int, np.float64, np.int64]]
+
+def fit_or_load_strategy(strategy, ticker, features_df, feature_cols):
+    """Fit ``strategy``, or load the stored model trained on exactly this data; returns split_idx"""
+    store = ModelStore(Config.MODEL_DIR, model_file=Config.MODEL_OUTPUT)
+    fingerprint = final_training_fingerprint(features_df, feature_cols)
+    version = store.find(ticker, fingerprint)
+    if version is not None:
+        strategy.predictor, _ = store.load(ticker, version)
+        split_idx = int(len(features_df) * 0.8)
+        print(f"   Loaded stored model {ticker} v{version} (training data unchanged)")
+    else:
+        split_idx = strategy.fit(features_df, feature_cols)
+        cv_scores = [r['mse'] for r in strategy.cv_report if r['mse'] is not None]
+        version = store.save(ticker, strategy.predictor, fingerprint, feature_cols,
+                             metrics={'cv_mse': float(np.mean(cv_scores)), 'split_idx': split_idx})
+        print(f"   Saved model {ticker} v{version} to {store.root}")
+    return split_idx
+
 def main_enhanced(ticker=Config.TARGET_TICKER):
     """Main execution with enhanced pipeline"""
     
@@ -712,18 +1159,13 @@ def main_enhanced(ticker=Config.TARGET_TICKER):
     print(f"   Feature rows after cleaning: {len(features_df)}")
     
     # Select features
-    exclude_cols = ['date', 'ticker', 'open', 'high', 'low', 'close', 'volume', 
-                   'target_next_return', 'target_direction', 'target_strong_move']
-    feature_cols = [c for c in features_df.columns 
-                   if c not in exclude_cols and 
-                   features_df[c].dtype in [float, int, np.float64, np.int64]]
-    
+    feature_cols = select_feature_cols(features_df)
     print(f"   Selected {len(feature_cols)} features")
     
-    # Train model
+    # Train model, or reuse the stored one trained on exactly this data
     print("\n3. Training Enhanced Model...")
     strategy = EnhancedStrategy()
-    split_idx = strategy.fit(features_df, feature_cols)
+    split_idx = fit_or_load_strategy(strategy, ticker, features_df, feature_cols)
     
     # Feature importance analysis
     importance_df = analyze_feature_importance(strategy.predictor, feature_cols)
@@ -734,7 +1176,7 @@ def main_enhanced(ticker=Config.TARGET_TICKER):
     
     # Backtest
     print("\n5. Enhanced Backtesting...")
-    backtest_df, metrics = enhanced_backtest(signals_df)
+    backtest_df, metrics = enhanced_backtest(signals_df, strategy.config)
     
     # Display results
     print("\n" + "=" * 50)
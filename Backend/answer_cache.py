@@ -0,0 +1,186 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_question(question):
+    """Case-, whitespace- and trailing-punctuation-insensitive form of a question"""
+    question = re.sub(r"\s+", " ", question.strip().lower())
+    return question.strip(" ?!.")
+
+
+# Numbers (years, amounts, percentages), quarters like Q3 and ticker-like upper-case words
+ENTITY_RE = re.compile(r"\$?\b(?:\d+(?:[.,]\d+)*|[Qq][1-4]|[A-Z][A-Z.]{0,5})\b%?")
+NON_ENTITIES = {"I", "A"}
+
+
+def question_entities(question):
+    """Years, figures, quarters and tickers mentioned in a question, sorted.
+
+    Questions that differ only in one of these ("revenue in 2022" vs "in
+    2023", "AAPL" vs "MSFT") embed almost identically, so they are part of
+    the cache scope and a semantic match never crosses them.
+    """
+    entities = {match.lstrip("$").upper() for match in ENTITY_RE.findall(question)}
+    return tuple(sorted(entities - NON_ENTITIES))
+
+
+class AnswerCache:
+    """TTL + LRU cache of answers keyed by (session, index fingerprint, question).
+
+    The session id and the fingerprint of the documents behind the answer are
+    part of every key, so answers never cross sessions and are invalidated as
+    soon as the session's document set changes. With ``embed_fn`` and a
+    ``similarity_threshold``, a miss on the exact normalized question falls
+    back to the most similar cached question in the same scope (cosine
+    similarity on question embeddings), so paraphrases also hit. The scope
+    also includes the question's entities (see ``question_entities``) and
+    keeps its own embedding matrix, so a lookup only searches that matrix.
+
+    The cache never fails a request: errors (e.g. from ``embed_fn``) are
+    logged and treated as a miss.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, similarity_threshold=None, embed_fn=None):
+        self.max_entries = max_entries or int(os.getenv("FINVEST_ANSWER_CACHE_SIZE", "1000"))
+        self.ttl = ttl if ttl is not None else float(os.getenv("FINVEST_ANSWER_CACHE_TTL", "3600"))
+        self.similarity_threshold = similarity_threshold if similarity_threshold is not None else \
+            float(os.getenv("FINVEST_ANSWER_CACHE_SIMILARITY", "0.92"))
+        self.embed_fn = embed_fn
+        self._entries = OrderedDict()
+        # scope -> {"questions": [...], "matrix": rows of unit question vectors}
+        self._scopes = {}
+        self._lock = threading.Lock()
+        self.counters = {"exact_hits": 0, "semantic_hits": 0, "misses": 0,
+                         "evictions": 0, "expirations": 0, "errors": 0}
+
+    @property
+    def semantic(self):
+        return self.embed_fn is not None and self.similarity_threshold > 0
+
+    def _embed(self, question):
+        vector = np.asarray(self.embed_fn(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expired(self, entry, now):
+        return self.ttl > 0 and now - entry["created_at"] > self.ttl
+
+    def _key(self, session_id, fingerprint, question):
+        return (session_id, fingerprint, question_entities(question)), normalize_question(question)
+
+    def _error(self, action, error):
+        print(f"Answer cache {action} failed, treating as a miss: {error}")
+        with self._lock:
+            self.counters["errors"] += 1
+
+    def _remove(self, key):
+        """Drop an entry and its matrix row; caller holds the lock"""
+        entry = self._entries.pop(key)
+        scope, question = key
+        rows = self._scopes.get(scope)
+        if entry["vector"] is None or rows is None:
+            return
+        i = rows["questions"].index(question)
+        del rows["questions"][i]
+        if rows["questions"]:
+            rows["matrix"] = np.delete(rows["matrix"], i, axis=0)
+        else:
+            del self._scopes[scope]
+
+    def get(self, session_id, fingerprint, question):
+        """Return ``(entry, question_vector)``; entry is None on a miss.
+
+        Pass ``question_vector`` back to ``put`` so a miss costs one embedding.
+        """
+        try:
+            return self._get(session_id, fingerprint, question)
+        except Exception as e:
+            self._error("lookup", e)
+            return None, None
+
+    def _get(self, session_id, fingerprint, question):
+        key = self._key(session_id, fingerprint, question)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._expired(entry, now):
+                    self._remove(key)
+                    self.counters["expirations"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.counters["exact_hits"] += 1
+                    return entry, None
+
+        if not self.semantic:
+            with self._lock:
+                self.counters["misses"] += 1
+            return None, None
+
+        vector = self._embed(question)
+        scope = key[0]
+        with self._lock:
+            rows = self._scopes.get(scope)
+            while rows is not None:
+                best = int(np.argmax(rows["matrix"] @ vector))
+                if float(rows["matrix"][best] @ vector) < self.similarity_threshold:
+                    break
+                best_key = (scope, rows["questions"][best])
+                if self._expired(self._entries[best_key], now):
+                    self._remove(best_key)
+                    self.counters["expirations"] += 1
+                    rows = self._scopes.get(scope)
+                    continue
+                self._entries.move_to_end(best_key)
+                self.counters["semantic_hits"] += 1
+                return self._entries[best_key], vector
+            self.counters["misses"] += 1
+        return None, vector
+
+    def put(self, session_id, fingerprint, question, answer, sources, question_vector=None):
+        try:
+            if question_vector is None and self.semantic:
+                try:
+                    question_vector = self._embed(question)
+                except Exception as e:
+                    # Still cache the answer for exact repeats
+                    self._error("embedding", e)
+            self._put(self._key(session_id, fingerprint, question), answer, sources,
+                      question_vector)
+        except Exception as e:
+            self._error("store", e)
+
+    def _put(self, key, answer, sources, question_vector):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {
+                "answer": answer,
+                "sources": sources,
+                "vector": question_vector,
+                "created_at": time.time(),
+            }
+            if question_vector is not None:
+                scope, question = key
+                rows = self._scopes.setdefault(scope, {"questions": [], "matrix": None})
+                rows["questions"].append(question)
+                rows["matrix"] = question_vector[None, :] if rows["matrix"] is None else \
+                    np.vstack([rows["matrix"], question_vector])
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.counters["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["entries"] = len(self._entries)
+            stats["scopes"] = len(self._scopes)
+        hits = stats["exact_hits"] + stats["semantic_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        return stats
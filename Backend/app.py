@@ -1,25 +1,51 @@
-from dotenv import load_dotenv
 import os
-from PyPDF2 import PdfReader
-from io import BytesIO
+import re
+import json
 from langchain.text_splitter import CharacterTextSplitter
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
-from langchain_community.vectorstores import FAISS  # Updated import
-from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
 from langchain.docstore.document import Document
-from flask import Flask, request, jsonify
+from langchain_community.vectorstores import FAISS
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-import yfinance as yf
 import pandas as pd
-from ISC import compute_enhanced_sentiment
+from ISC import Config, EnhancedStrategy, compute_enhanced_sentiment, live_feature_matrix
+from model_registry import registry
+from knowledge_store import KnowledgeStore, DEFAULT_SESSION
+from index_store import IndexStore, document_hash
+from pdf_extract import PdfTooLargeError, iter_pdf_pages, read_upload
+from jobs import JobManager
+from answer_cache import AnswerCache
+from market_data import MarketDataStore
+from model_store import ModelStore
+from prediction_batcher import PredictionBatcher
+from streaming_indicators import RollingMeanCache
 
 app = Flask(__name__)
 CORS(app)
 
-# Global variables to store the QA chain and knowledge base
-qa_chain = None
-knowledge_base = None
+# Per-session FAISS indexes, chat memory and QA chains
+knowledge_store = KnowledgeStore()
+# Per-document FAISS indexes persisted on disk so ingests survive restarts
+index_store = IndexStore()
+# Background ingestion jobs polled through /api/jobs/<id>
+job_manager = JobManager()
+# Answers to repeated (or paraphrased) questions, scoped per session and document set
+answer_cache = AnswerCache(embed_fn=lambda question: registry.get_embeddings().embed_query(question))
+# Fingerprint used for answers given without any documents
+NO_DOCUMENTS = "no-documents"
+# Daily bars shared by /api/price-series and /api/sentiment, fetched once per range
+market_data = MarketDataStore()
+# 20-day moving averages per symbol, extended with only the new bars on each refresh
+ma20_cache = RollingMeanCache(20)
+# Trained strategy ensembles saved by ISC.main_enhanced, kept warm once loaded
+model_store = ModelStore(Config.MODEL_DIR, model_file=Config.MODEL_OUTPUT)
+# Concurrent /api/predict requests share one predict_with_confidence call
+prediction_batcher = PredictionBatcher()
+# Signal rules (thresholds, sizing) applied to model predictions
+signal_strategy = EnhancedStrategy()
+# Model used for symbols without their own trained model
+DEFAULT_PREDICT_MODEL = os.getenv("FINVEST_PREDICT_MODEL", Config.TARGET_TICKER)
+# Ticker symbols accepted by /api/predict (the symbol also names the model directory)
+SYMBOL_RE = re.compile(r"[A-Z0-9][A-Z0-9.\-]{0,9}")
 
 # Add default financial context
 DEFAULT_FINANCIAL_CONTEXT = """
@@ -37,51 +63,136 @@ If specific documents are provided, analyze them in detail while incorporating y
 """
 
 def initialize_models():
-    load_dotenv()
-    return (
-        GoogleGenerativeAIEmbeddings(model="models/embedding-001"),
-        ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            convert_system_message_to_human=True,
-            temperature=0.7,
-            top_p=0.95,
-            top_k=40,
-        )
-    )
+    # Clients are built once per process and shared across requests
+    return registry.get_models()
+
+def get_session_id(data=None):
+    """Session key from the JSON body, form field or X-Session-Id header"""
+    session_id = None
+    if data:
+        session_id = data.get('session_id')
+    if not session_id:
+        session_id = request.form.get('session_id') or request.headers.get('X-Session-Id')
+    return session_id or DEFAULT_SESSION
+
+# Chunks embedded per FAISS add while a document is still being extracted; large
+# enough for the embedding executor to spread each add over its concurrent batches
+INDEX_BATCH_SIZE = 256
+
+def split_documents(text, metadata=None):
+    text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    return [Document(page_content=chunk, metadata=dict(metadata or {}))
+            for chunk in text_splitter.split_text(text)]
+
+def iter_page_documents(pages, source=None):
+    """Chunk pages as they arrive, tagging each chunk with its page number"""
+    for page_number, page_text in pages:
+        metadata = {"page": page_number}
+        if source:
+            metadata["source"] = source
+        yield from split_documents(page_text, metadata)
+
+def build_index(documents, embeddings, job=None):
+    """Build a FAISS index from a (possibly lazy) stream of documents in batches"""
+    vectorstore = None
+    chunk_count = 0
+    batch = []
+    
+    def flush(batch):
+        nonlocal vectorstore
+        if job:
+            job.check_cancelled()
+        if vectorstore is None:
+            vectorstore = FAISS.from_documents(batch, embeddings)
+        else:
+            vectorstore.add_documents(batch)
+        if job:
+            job.increment("chunks_embedded", len(batch))
+    
+    for doc in documents:
+        batch.append(doc)
+        chunk_count += 1
+        if len(batch) >= INDEX_BATCH_SIZE:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    
+    # Add print statements for debugging
+    print(f"Number of chunks: {chunk_count}")
+    if vectorstore is None:
+        raise ValueError("No text could be extracted from the document")
+    return vectorstore
+
+def ingest_document(doc_hash, make_documents, session_id=DEFAULT_SESSION, job=None):
+    """Add a document to the session, reusing its persisted index if there is one.
+
+    ``make_documents`` is only called (and the document only chunked and
+    embedded) when no index for ``doc_hash`` exists yet. Progress and
+    cancellation go through ``job`` when run in the background.
+    """
+    embeddings, llm = initialize_models()
+    
+    vectorstore = index_store.load(doc_hash, embeddings)
+    cached = vectorstore is not None
+    if cached:
+        print(f"Loaded persisted index for document {doc_hash[:12]}")
+    else:
+        if job:
+            job.update(stage="embedding", chunks_embedded=0)
+        vectorstore = build_index(make_documents(), embeddings, job)
+        index_store.save(doc_hash, vectorstore)
+    chunk_count = vectorstore.index.ntotal
+    
+    if job:
+        job.check_cancelled()
+        job.update(stage="indexing")
+    # Merged into this session's index; other sessions are untouched
+    knowledge_store.add_vectorstore(session_id, doc_hash, vectorstore, embeddings, llm,
+                                    read_only=cached)
+    index_store.record_session_document(session_id, doc_hash)
+    if job:
+        job.update(index_built=True)
+    return {"document_id": doc_hash, "chunks": chunk_count, "cached": cached}
 
-def process_text(text):
+def process_text(text, session_id=DEFAULT_SESSION, job=None):
     try:
-        embeddings, llm = initialize_models()
-        text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        chunks = text_splitter.split_text(text)
-        
-        global knowledge_base, qa_chain
-        
-        # Add print statements for debugging
-        print(f"Number of chunks: {len(chunks)}")
-        print(f"First chunk sample: {chunks[0][:100]}...")
-        
-        documents = [Document(page_content=chunk) for chunk in chunks]
-        knowledge_base = FAISS.from_documents(documents, embeddings)
-        
-        memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True,
-            output_key="answer"  # Add this line
-        )
-        
-        qa_chain = ConversationalRetrievalChain.from_llm(
-            llm=llm,
-            retriever=knowledge_base.as_retriever(),
-            memory=memory,
-            return_source_documents=True,
-            verbose=True  # Add this for debugging
-        )
-        
+        initialize_models()
+        doc_hash = document_hash(text, registry.embedding_model_name)
+        return ingest_document(doc_hash, lambda: split_documents(text), session_id, job)
     except Exception as e:
         print(f"Error in process_text: {str(e)}")
         raise
 
+def get_knowledge_base(session_id):
+    """In-memory knowledge base for the session, restored from disk if needed"""
+    kb = knowledge_store.get(session_id)
+    if kb is None and index_store.session_documents(session_id):
+        embeddings, llm = initialize_models()
+        kb = knowledge_store.restore(session_id, index_store, embeddings, llm)
+    return kb
+
+def process_pdf_bytes(job, pdf_bytes, filename, session_id):
+    """Background job body for /api/process-pdf"""
+    initialize_models()
+    doc_hash = document_hash(pdf_bytes, registry.embedding_model_name)
+    
+    # Pages are extracted in parallel and chunked/embedded as they arrive
+    job.update(stage="extracting", pages_extracted=0, characters=0)
+    def page_documents():
+        for page_number, page_text in iter_pdf_pages(pdf_bytes):
+            job.check_cancelled()
+            job.increment("pages_extracted")
+            job.increment("characters", len(page_text))
+            yield page_number, page_text
+    
+    return ingest_document(
+        doc_hash,
+        lambda: iter_page_documents(page_documents(), source=filename),
+        session_id,
+        job
+    )
+
 @app.route('/api/process-document', methods=['POST'])
 def process_document():
     try:
@@ -91,8 +202,14 @@ def process_document():
         if not text:
             return jsonify({"status": "error", "message": "No text provided"}), 400
         
-        process_text(text)
-        return jsonify({"status": "success", "message": "Document processed successfully"})
+        session_id = get_session_id(data)
+        job = job_manager.submit("process-document",
+                                 lambda job: process_text(text, session_id, job))
+        return jsonify({
+            "status": "accepted",
+            "message": "Document queued for processing",
+            "job_id": job.id
+        }), 202
     
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -107,27 +224,35 @@ def process_pdf():
         if pdf_file.filename == '':
             return jsonify({"status": "error", "message": "No file selected"}), 400
         
-        # Read PDF content
-        pdf_content = BytesIO(pdf_file.read())
-        pdf_reader = PdfReader(pdf_content)
-        
-        # Extract text from PDF
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        
-        # Process the extracted text
-        process_text(text)
-        
+        # The upload has to be read before the request ends; the rest runs in the background
+        pdf_bytes = read_upload(pdf_file.stream)
+        job = job_manager.submit("process-pdf", process_pdf_bytes,
+                                 pdf_bytes, pdf_file.filename, get_session_id())
         return jsonify({
-            "status": "success",
-            "message": "PDF processed successfully",
-            "text": text
-        })
+            "status": "accepted",
+            "message": "PDF queued for processing",
+            "job_id": job.id
+        }), 202
     
+    except PdfTooLargeError as e:
+        return jsonify({"status": "error", "message": str(e)}), 413
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    return jsonify({"status": "success", "job": job.to_dict()})
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    return jsonify({"status": "success", "job": job.to_dict()})
+
 @app.route('/api/ask', methods=['POST'])
 def ask_question():
     try:
@@ -140,56 +265,128 @@ def ask_question():
                 "message": "No question provided"
             }), 400
         
-        if not qa_chain:
+        session_id = get_session_id(data)
+        kb = get_knowledge_base(session_id)
+        has_documents = kb is not None and kb.qa_chain is not None
+        fingerprint = kb.fingerprint if has_documents else NO_DOCUMENTS
+        
+        cached, question_vector = answer_cache.get(session_id, fingerprint, question)
+        if cached is not None:
+            if has_documents:
+                kb.save_turn(question, cached["answer"])
+            return jsonify({
+                "status": "success",
+                "answer": cached["answer"],
+                "sources": cached["sources"],
+                "cached": True
+            })
+        
+        if not has_documents:
             # If no documents are loaded, use direct LLM with financial context
-            _, llm = initialize_models()
+            llm = registry.get_llm()
             response = llm.invoke(
                 f"{DEFAULT_FINANCIAL_CONTEXT}\n\nQuestion: {question}\n\nAnswer:"
             )
-            return jsonify({
-                "status": "success",
-                "answer": response.content,
-                "sources": []
+            answer = response.content
+            sources = []
+        else:
+            # If documents are loaded, use the QA chain
+            result = kb.invoke({
+                "question": question,
+                "context": DEFAULT_FINANCIAL_CONTEXT
             })
+            answer = result["answer"]
+            sources = format_sources(result.get("source_documents", []))
         
-        # If documents are loaded, use the QA chain
-        result = qa_chain.invoke({
-            "question": question,
-            "context": DEFAULT_FINANCIAL_CONTEXT
-        })
-        
-        answer = result["answer"]
-        sources = []
-        if "source_documents" in result:
-            for doc in result["source_documents"]:
-                sources.append({
-                    "content": doc.page_content[:200] + "...",
-                    "metadata": doc.metadata
-                })
-        
+        answer_cache.put(session_id, fingerprint, question, answer, sources, question_vector)
         return jsonify({
             "status": "success",
             "answer": answer,
-            "sources": sources
+            "sources": sources,
+            "cached": False
         })
     
     except Exception as e:
         print(f"Error in ask_question: {str(e)}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+def format_sources(docs):
+    return [
+        {
+            "content": doc.page_content[:200] + "...",
+            "metadata": doc.metadata
+        }
+        for doc in docs
+    ]
+
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.route('/api/ask/stream', methods=['POST'])
+def ask_question_stream():
+    """Same as /api/ask but streams the answer as Server-Sent Events:
+    ``token`` events with answer pieces, one ``sources`` event, then ``done``."""
+    data = request.get_json()
+    question = data.get('question', '')
+    if not question:
+        return jsonify({"status": "error", "message": "No question provided"}), 400
+    session_id = get_session_id(data)
+    
+    def generate():
+        try:
+            kb = get_knowledge_base(session_id)
+            has_documents = kb is not None and kb.qa_chain is not None
+            fingerprint = kb.fingerprint if has_documents else NO_DOCUMENTS
+            
+            cached, question_vector = answer_cache.get(session_id, fingerprint, question)
+            if cached is not None:
+                if has_documents:
+                    kb.save_turn(question, cached["answer"])
+                yield sse_event("token", {"token": cached["answer"]})
+                yield sse_event("sources", {"sources": cached["sources"]})
+                yield sse_event("done", {"status": "success", "cached": True})
+                return
+            
+            parts = []
+            if not has_documents:
+                llm = registry.get_llm()
+                prompt = f"{DEFAULT_FINANCIAL_CONTEXT}\n\nQuestion: {question}\n\nAnswer:"
+                for chunk in llm.stream(prompt):
+                    parts.append(chunk.content)
+                    yield sse_event("token", {"token": chunk.content})
+                sources = []
+            else:
+                for kind, value in kb.stream(question):
+                    if kind == "token":
+                        parts.append(value)
+                        yield sse_event("token", {"token": value})
+                    else:
+                        sources = format_sources(value)
+            yield sse_event("sources", {"sources": sources})
+            answer_cache.put(session_id, fingerprint, question, "".join(parts), sources,
+                             question_vector)
+            yield sse_event("done", {"status": "success", "cached": False})
+        except Exception as e:
+            print(f"Error in ask_question_stream: {str(e)}")
+            yield sse_event("error", {"status": "error", "message": str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.route('/api/price-series', methods=['POST'])
 def price_series():
     try:
         data = request.get_json()
         symbol = data.get('symbol', 'IBM')
         days = int(data.get('days', 120))
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=f"{days}d")
+        hist = market_data.history(symbol, days)
         if hist.empty:
             return jsonify({"status": "error", "message": "No data found"}), 404
-        hist = hist.reset_index()
         hist['date'] = pd.to_datetime(hist['Date']).dt.strftime('%Y-%m-%d')
-        hist['ma20'] = hist['Close'].rolling(window=20).mean()
+        hist['ma20'] = ma20_cache.rolling_mean(symbol.upper(), hist['Date'], hist['Close'])
         last_close = hist['Close'].iloc[-1]
         last_ma20 = hist['ma20'].iloc[-1]
         if pd.isna(last_ma20):
@@ -221,10 +418,10 @@ def price_series():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
-def fetch_and_merge_sentiment(symbol, hist):
+def simulated_news(symbol, dates):
     # Simulate news for each date (replace with real news if available)
     sentiment_rows = []
-    for i, date in enumerate(hist['Date']):
+    for i, date in enumerate(dates):
         if i % 2 == 0:
             text = "profit growth strong beat record"
         else:
@@ -234,7 +431,10 @@ def fetch_and_merge_sentiment(symbol, hist):
             "ticker": symbol,
             "text": text
         })
-    sentiment_df = pd.DataFrame(sentiment_rows)
+    return pd.DataFrame(sentiment_rows)
+
+def fetch_and_merge_sentiment(symbol, hist):
+    sentiment_df = simulated_news(symbol, hist['Date'])
     daily_sent = compute_enhanced_sentiment(sentiment_df)
     # Merge with price data
     hist = hist.copy()
@@ -251,24 +451,10 @@ def get_sentiment():
         symbol = data.get('symbol', 'IBM')
         days = int(data.get('days', 7))
         # Fetch recent price data for dates
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=f"{days}d")
+        hist = market_data.history(symbol, days)
         if hist.empty:
             return jsonify({"status": "error", "message": "No data found"}), 404
-        hist = hist.reset_index()
-        # Simulate news for each date (replace with real news if available)
-        sentiment_rows = []
-        for i, date in enumerate(hist['Date']):
-            if i % 2 == 0:
-                text = "profit growth strong beat record"
-            else:
-                text = "loss decline risk drop weak"
-            sentiment_rows.append({
-                "date": date,
-                "ticker": symbol,
-                "text": text
-            })
-        sentiment_df = pd.DataFrame(sentiment_rows)
+        sentiment_df = simulated_news(symbol, hist['Date'])
         daily_sent = compute_enhanced_sentiment(sentiment_df)
         # Aggregate sentiment
         avg_sentiment = daily_sent['sentiment'].mean()
@@ -283,5 +469,67 @@ def get_sentiment():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/api/predict', methods=['POST'])
+def predict():
+    try:
+        data = request.get_json()
+        symbol = data.get('symbol', 'IBM')
+        if not isinstance(symbol, str) or not SYMBOL_RE.fullmatch(symbol.upper()):
+            return jsonify({"status": "error", "message": "Invalid symbol"}), 400
+        symbol = symbol.upper()
+        # The slowest features (50-day MA, 20-day momentum) need ~75 calendar days
+        days = int(data.get('days', 180))
+        predictor, meta = model_store.get(symbol)
+        if predictor is None:
+            predictor, meta = model_store.get(DEFAULT_PREDICT_MODEL)
+        if predictor is None:
+            return jsonify({"status": "error",
+                            "message": "No trained strategy model, run ISC.py first"}), 404
+        hist = market_data.history(symbol, days)
+        if hist.empty:
+            return jsonify({"status": "error", "message": "No data found"}), 404
+        market_df = hist.rename(columns=str.lower).assign(ticker=symbol)
+        feature_cols = meta['feature_cols']
+        features, missing = live_feature_matrix(market_df, simulated_news(symbol, hist['Date']),
+                                                feature_cols, center=predictor.scaler.center_)
+        if features.empty:
+            return jsonify({"status": "error",
+                            "message": "Not enough history to compute features"}), 400
+        latest = features.iloc[-1]
+        pred, confidence = prediction_batcher.predict(predictor, features[feature_cols].values[-1:])
+        signal, final_score, position_size = signal_strategy.signal_for(
+            float(pred[0]), float(confidence[0]), latest['sentiment'], latest['confidence'])
+        return jsonify({
+            "status": "success",
+            "symbol": symbol,
+            "date": pd.Timestamp(latest['date']).strftime('%Y-%m-%d'),
+            "model": {"name": meta['name'], "version": meta['version']},
+            "pred_next_return": float(pred[0]),
+            "pred_confidence": float(confidence[0]),
+            "signal": signal,
+            "final_score": float(final_score),
+            "position_size": float(position_size),
+            "missing_features": missing
+        })
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route('/api/models', methods=['GET'])
+def models_status():
+    return jsonify({
+        "status": "success",
+        "models": registry.stats(),
+        "knowledge_store": knowledge_store.stats(),
+        "index_store": index_store.stats(),
+        "answer_cache": answer_cache.stats(),
+        "market_data": market_data.stats(),
+        "strategy_models": model_store.stats(),
+        "predict_batcher": prediction_batcher.stats()
+    })
+
 if __name__ == '__main__':
+    if os.getenv("FINVEST_WARM_MODELS", "1") == "1":
+        timings = registry.warm_up(probe=os.getenv("FINVEST_WARM_PROBE", "0") == "1")
+        print(f"Models warmed: {timings}")
+        print(f"Strategy models warmed: {model_store.warm_up()}")
     app.run(port=5000, debug=True)
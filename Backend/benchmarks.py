@@ -0,0 +1,239 @@
+"""Timings of the vectorized strategy pipeline against the implementations it replaced.
+
+Correctness is covered by the tests (``python -m pytest tests``); this only
+measures speed. ``python benchmarks.py [name ...]`` runs all benchmarks or
+the named ones.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from ISC import (Config, RunConfig, aggregate_daily_sentiment, compute_enhanced_sentiment,
+                 compute_panel_technical_indicators, enhanced_backtest, rolling_slope, score_text, score_texts,
+                 technical_indicator_columns)
+from data_store import convert_csv, load_ticker
+from portfolio_backtest import portfolio_backtest
+from streaming_indicators import IndicatorState
+from tests.reference import (aggregate_daily_sentiment_apply, enhanced_backtest_iterrows,
+                             fitted_strategy, generate_signals_apply, linregress_slope, per_ticker_indicators, random_feature_rows,
+                             random_panel, random_prices, random_scored_headlines,
+                             score_texts_per_row, simulated_feed, simulated_signals)
+
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+@benchmark
+def rolling_slope_vs_linregress(n_rows=20000, windows=None):
+    """Trend features: vectorized rolling OLS vs linregress per window"""
+    close = random_prices(n_rows)
+    results = {}
+    for window in windows or Config.TREND_WINDOWS:
+        _, linregress_s = timed(linregress_slope, close, window)
+        _, vectorized_s = timed(rolling_slope, close, window)
+        results[window] = {'linregress_s': linregress_s, 'vectorized_s': vectorized_s}
+        print(f"trend_{window}: linregress {linregress_s:.3f}s, vectorized {vectorized_s:.5f}s "
+              f"({linregress_s / vectorized_s:.0f}x)")
+    return results
+
+
+@benchmark
+def panel_indicators(n_tickers=500, n_days=1000):
+    """Technical indicators: one panel pass vs one call per ticker"""
+    panel = random_panel(n_tickers, n_days)
+    _, loop_s = timed(per_ticker_indicators, panel)
+    _, panel_s = timed(compute_panel_technical_indicators, panel)
+    print(f"{n_tickers} tickers x {n_days} days: per-ticker {loop_s:.2f}s, "
+          f"panel {panel_s:.2f}s ({loop_s / panel_s:.1f}x)")
+    return {'per_ticker_s': loop_s, 'panel_s': panel_s}
+
+
+@benchmark
+def streaming_indicators(n_bars=2520):
+    """Cost of one new bar: IndicatorState.update vs recomputing the whole history"""
+    bars = random_panel(1, n_bars)
+    _, batch_s = timed(technical_indicator_columns, bars['open'], bars['high'], bars['low'],
+                       bars['close'], bars['volume'])
+    state = IndicatorState()
+    rows = list(bars[['open', 'high', 'low', 'close', 'volume']].itertuples(index=False))
+    _, stream_s = timed(lambda: [state.update(*row) for row in rows])
+    per_bar_us = stream_s / n_bars * 1e6
+    print(f"{n_bars} bars: batch recompute {batch_s * 1000:.1f}ms, "
+          f"streaming update {per_bar_us:.1f}us per bar")
+    return {'batch_s': batch_s, 'stream_per_bar_us': per_bar_us}
+
+
+@benchmark
+def sentiment_scoring(n_headlines=100000):
+    """Headline scoring: deduplicated + memoized score_texts vs VADER on every row"""
+    texts = simulated_feed(n_headlines)['text']
+    _, original_s = timed(score_texts_per_row, texts)
+    score_text.cache_clear()
+    _, scorer_s = timed(score_texts, texts)
+    print(f"{len(texts)} headlines ({texts.nunique()} distinct): per-row {original_s:.2f}s, "
+          f"deduplicated + memoized {scorer_s * 1000:.1f}ms ({original_s / scorer_s:.0f}x)")
+    return {'original_s': original_s, 'scorer_s': scorer_s}
+
+
+@benchmark
+def daily_sentiment_aggregation(n_tickers=20, n_days=2500):
+    """Daily sentiment: grouped array sums vs groupby().apply"""
+    scored = random_scored_headlines(n_tickers, n_days)
+    daily, apply_s = timed(aggregate_daily_sentiment_apply, scored)
+    _, vectorized_s = timed(aggregate_daily_sentiment, scored)
+    print(f"{len(scored)} headlines -> {len(daily)} (date, ticker) groups: apply {apply_s:.2f}s, "
+          f"vectorized {vectorized_s * 1000:.1f}ms ({apply_s / vectorized_s:.0f}x)")
+    return {'apply_s': apply_s, 'vectorized_s': vectorized_s}
+
+
+@benchmark
+def parallel_sentiment(n_headlines=200000, workers=None, chunk_size=20000):
+    """Sentiment for a feed of distinct headlines: serial vs process pool"""
+    workers = workers or os.cpu_count() or 1
+    feed = simulated_feed(n_headlines, start='1990-01-01')
+    # Make headlines distinct so deduplication does not hide the scoring cost
+    feed['text'] = feed['text'] + ' ' + feed.index.astype(str)
+    score_text.cache_clear()
+    _, serial_s = timed(compute_enhanced_sentiment, feed, workers=1)
+    score_text.cache_clear()
+    _, parallel_s = timed(compute_enhanced_sentiment, feed, workers=workers, chunk_size=chunk_size)
+    print(f"{len(feed)} headlines: serial {serial_s:.2f}s, {workers} workers {parallel_s:.2f}s "
+          f"({serial_s / parallel_s:.1f}x)")
+    return {'serial_s': serial_s, 'parallel_s': parallel_s}
+
+
+@benchmark
+def inference(n_rows=100000, n_features=32, n_train=2000):
+    """Signals for a test period: single-pass scoring vs predictions + row-wise apply"""
+    strategy, rng = fitted_strategy(n_train, n_features)
+    feature_cols = [f'f{i}' for i in range(n_features)]
+    df = random_feature_rows(rng, n_rows, feature_cols)
+    _, apply_s = timed(generate_signals_apply, strategy, df, feature_cols, 0)
+    _, vectorized_s = timed(strategy.generate_signals, df, feature_cols, 0)
+    _, models_s = timed(strategy.predictor.predict_components, df[feature_cols].values)
+    print(f"{n_rows} rows: row-wise {apply_s:.2f}s, single pass {vectorized_s:.2f}s "
+          f"({apply_s / vectorized_s:.1f}x); of which model predictions {models_s:.2f}s, "
+          f"signal rules {max(apply_s - models_s, 0):.2f}s vs {max(vectorized_s - models_s, 0):.3f}s")
+    return {'apply_s': apply_s, 'vectorized_s': vectorized_s, 'models_s': models_s}
+
+
+@benchmark
+def backtest(n_bars=1000000, loop_bars=20000):
+    """Backtest: per-trade array engine vs the iterrows loop, then the engine on ``n_bars``"""
+    results = {}
+    for trade_prob in (0.01, 0.05, 0.3, 1.0):
+        signals = simulated_signals(loop_bars, trade_prob)
+        _, loop_s = timed(enhanced_backtest_iterrows, signals)
+        _, engine_s = timed(enhanced_backtest, signals)
+        print(f"{loop_bars} bars, {trade_prob:.0%} signal days: iterrows {loop_s:.2f}s, "
+              f"engine {engine_s * 1000:.1f}ms")
+    for trade_prob in (0.01, 0.05):
+        signals = simulated_signals(n_bars, trade_prob)
+        (result, _), results[trade_prob] = timed(enhanced_backtest, signals)
+        trades = int(result['signal'].isin(['BUY', 'SELL']).sum())
+        print(f"{n_bars} bars, {trade_prob:.0%} signal days ({trades} signals): "
+              f"{results[trade_prob]:.2f}s")
+    return results
+
+
+@benchmark
+def portfolio(n_tickers=500, n_days=252 * 25, seed=0):
+    """Multi-asset backtest of a large basket: time and peak extra memory"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('1990-01-01', periods=n_days)
+    tickers = [f'T{i:04d}' for i in range(n_tickers)]
+    close = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (n_days, n_tickers)), axis=0)),
+                         index=dates, columns=tickers)
+    draw = rng.uniform(size=(n_days, n_tickers))
+    signal = pd.DataFrame(np.where(draw < 0.025, 1, np.where(draw < 0.05, -1, 0)).astype(np.int8),
+                          index=dates, columns=tickers)
+    size = pd.DataFrame(rng.uniform(0, Config.MAX_POSITION_SIZE, (n_days, n_tickers)),
+                        index=dates, columns=tickers)
+
+    tracemalloc.start()
+    (_, metrics), elapsed = timed(portfolio_backtest, close, signal, size,
+                                  RunConfig(MAX_GROSS_EXPOSURE=1.0))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    inputs_mb = (close.memory_usage().sum() + signal.memory_usage().sum() +
+                 size.memory_usage().sum()) / 2 ** 20
+    print(f"{n_tickers} tickers x {n_days} days: {elapsed:.2f}s, peak extra memory "
+          f"{peak / 2 ** 20:.0f}MB (inputs {inputs_mb:.0f}MB); "
+          f"sharpe {metrics['sharpe']:.2f}, annual turnover {metrics['annual_turnover']:.1f}")
+    return {'seconds': elapsed, 'peak_mb': peak / 2 ** 20}
+
+
+
+@benchmark
+def data_store_load(n_tickers=500, n_days=2520, seed=0):
+    """Single-ticker load from a wide market CSV vs the partitioned store: time and peak memory"""
+    import pyarrow as pa
+    from concurrent.futures import ProcessPoolExecutor
+
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2000-01-01', periods=n_days)
+    market = pd.DataFrame({
+        'date': np.tile(dates, n_tickers),
+        'ticker': np.repeat([f'T{i:04d}' for i in range(n_tickers)], n_days),
+    })
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        market[col] = rng.uniform(50, 150, len(market))
+
+    work_dir = tempfile.mkdtemp(prefix='data-store-bench-')
+    try:
+        csv_path = os.path.join(work_dir, 'market.csv')
+        market.to_csv(csv_path, index=False)
+        del market
+        # Convert in a child process so Arrow's high-water mark below only covers the loads
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            _, convert_s = timed(lambda: pool.submit(convert_csv, csv_path, work_dir, 'market').result())
+
+        def measure(load):
+            arrow_pool = pa.default_memory_pool()
+            arrow_before = arrow_pool.bytes_allocated()
+            tracemalloc.start()
+            _, elapsed = timed(load)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return elapsed, (peak + max(0, arrow_pool.max_memory() - arrow_before)) / 2 ** 20
+
+        def load_csv():
+            market = pd.read_csv(csv_path, parse_dates=['date'])
+            return market[market['ticker'] == ticker].sort_values('date').reset_index(drop=True)
+
+        # Store first: max_memory() is a high-water mark, and pandas may read CSV strings into Arrow
+        ticker = 'T0042'
+        load_ticker(work_dir, 'market', 'T0000')  # Pay pyarrow's one-time initialization outside the timing
+        store_s, store_mb = measure(lambda: load_ticker(work_dir, 'market', ticker))
+        csv_s, csv_mb = measure(load_csv)
+
+        csv_mb_on_disk = os.path.getsize(csv_path) / 2 ** 20
+        print(f'{n_tickers} tickers x {n_days} days ({csv_mb_on_disk:.0f}MB CSV, converted in '
+              f'{convert_s:.1f}s): CSV load {csv_s:.2f}s / {csv_mb:.0f}MB peak, '
+              f'store load {store_s * 1000:.0f}ms / {store_mb:.1f}MB peak')
+        return {'csv_s': csv_s, 'csv_mb': csv_mb, 'store_s': store_s, 'store_mb': store_mb}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or list(BENCHMARKS):
+        print(f"== {name}")
+        BENCHMARKS[name]()
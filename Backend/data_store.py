@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import tempfile
+from urllib.parse import quote
+
+import pandas as pd
+
+
+COLUMNS_FILE = "_columns.json"
+
+
+def _partitioning(fields=("ticker", "year")):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    types = {"ticker": pa.string(), "year": pa.int32()}
+    return ds.partitioning(pa.schema([(field, types[field]) for field in fields]), flavor="hive")
+
+
+def dataset_path(data_dir, name):
+    return os.path.join(data_dir, name)
+
+
+def has_dataset(data_dir, name):
+    return bool(data_dir) and os.path.exists(os.path.join(dataset_path(data_dir, name), COLUMNS_FILE))
+
+
+def _source_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return {"path": os.path.abspath(csv_path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def read_metadata(data_dir, name):
+    """Column list and source CSV stamp written by ``convert_csv``.
+
+    Stores converted before the stamp was recorded hold just the column
+    list; their ``source`` is None.
+    """
+    with open(os.path.join(dataset_path(data_dir, name), COLUMNS_FILE)) as f:
+        metadata = json.load(f)
+    if isinstance(metadata, list):
+        metadata = {"columns": metadata, "source": None}
+    return metadata
+
+
+def is_current(data_dir, name, csv_path):
+    """True if the dataset exists and ``csv_path`` has not changed since it was converted.
+
+    A missing CSV leaves the dataset as the only copy, so it counts as
+    current; a CSV whose size or mtime differs from the recorded stamp (or a
+    dataset without a stamp) does not.
+    """
+    if not has_dataset(data_dir, name):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    source = read_metadata(data_dir, name)["source"]
+    stamp = _source_stamp(csv_path)
+    return source is not None and all(source[key] == stamp[key] for key in ("mtime_ns", "size"))
+
+
+def convert_csv(csv_path, data_dir, name, chunksize=1000000):
+    """Rewrite a ``date``/``ticker`` CSV as Parquet partitioned by ticker and year.
+
+    The CSV is streamed in ``chunksize`` rows, so converting a file larger
+    than memory is fine. The dataset is built in a temp dir and swapped in,
+    so readers never see a half-written copy. The CSV's size and mtime are
+    recorded next to the column list so ``is_current`` can tell when the
+    dataset is out of date. Returns the number of rows.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    os.makedirs(data_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=data_dir, prefix=f".{name}-")
+    source = _source_stamp(csv_path)
+    columns = list(pd.read_csv(csv_path, nrows=0).columns)
+    rows = 0
+    try:
+        for i, chunk in enumerate(pd.read_csv(csv_path, parse_dates=["date"], chunksize=chunksize)):
+            if chunk.empty:
+                continue
+            chunk["year"] = chunk["date"].dt.year.astype("int32")
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            ds.write_dataset(table, tmp_dir, format="parquet", partitioning=_partitioning(),
+                             basename_template=f"part-{i:05d}-{{i}}.parquet",
+                             existing_data_behavior="overwrite_or_ignore")
+            rows += len(chunk)
+        with open(os.path.join(tmp_dir, COLUMNS_FILE), "w") as f:
+            json.dump({"columns": columns, "source": source}, f)
+        target = dataset_path(data_dir, name)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(tmp_dir, target)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return rows
+
+
+def load_ticker(data_dir, name, ticker, columns=None, start=None, end=None):
+    """Rows of one ticker (optionally ``start <= date <= end``), only the requested columns.
+
+    Only the ticker's partition is opened, the year filter prunes its year
+    files and the date filter is pushed down to Parquet row groups, so only
+    the matching files and columns are read. Returns the same frame as reading the CSV and
+    filtering it in memory; a ticker with no data gives an empty frame with
+    the same columns and dtypes.
+    """
+    import pyarrow.dataset as ds
+
+    path = dataset_path(data_dir, name)
+    all_columns = read_metadata(data_dir, name)["columns"]
+    columns = [c for c in all_columns if columns is None or c in columns or c in ("date", "ticker")]
+
+    # Open only this ticker's partition (hive paths are URI-encoded), so the
+    # other tickers' directories are never even listed
+    ticker_dir = os.path.join(path, f"ticker={quote(ticker, safe='')}")
+    if not os.path.isdir(ticker_dir):
+        # Types come from the schema of the other tickers' files
+        schema = ds.dataset(path, format="parquet", partitioning=_partitioning()).schema
+        frame = schema.empty_table().select([c for c in columns if c != "ticker"]).to_pandas()
+        frame.insert(columns.index("ticker"), "ticker", pd.Series([ticker]).iloc[:0])
+        return frame
+
+    condition = None
+    if start is not None:
+        start = pd.Timestamp(start)
+        condition = (ds.field("year") >= start.year) & (ds.field("date") >= start)
+    if end is not None:
+        end = pd.Timestamp(end)
+        upper = (ds.field("year") <= end.year) & (ds.field("date") <= end)
+        condition = upper if condition is None else condition & upper
+
+    dataset = ds.dataset(ticker_dir, format="parquet", partitioning=_partitioning(["year"]))
+    table = dataset.to_table(columns=[c for c in columns if c != "ticker"], filter=condition)
+    frame = table.to_pandas()
+    frame.insert(columns.index("ticker"), "ticker", ticker)
+    return frame.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def convert_all(data_dir, csv_paths):
+    """Convert every existing CSV in ``{name: path}``"""
+    for name, csv_path in csv_paths.items():
+        if os.path.exists(csv_path):
+            rows = convert_csv(csv_path, data_dir, name)
+            print(f"{csv_path}: {rows} rows -> {dataset_path(data_dir, name)}")
+
+
+if __name__ == "__main__":
+    from ISC import Config
+    convert_all(Config.DATA_STORE_DIR, {
+        "market": Config.MARKET_CSV,
+        "sentiment": Config.SENTIMENT_CSV,
+        "earnings": Config.EARNINGS_CSV,
+    })
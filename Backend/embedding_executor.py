@@ -0,0 +1,212 @@
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+
+# Exception class names / message fragments that mean "slow down and retry"
+RETRYABLE_ERRORS = {"ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+                    "DeadlineExceeded", "InternalServerError", "RateLimitError"}
+RETRYABLE_MESSAGES = ("429", "503", "quota", "rate limit", "temporarily unavailable")
+
+
+def is_retryable(error):
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    if isinstance(error, (ConnectionError, TimeoutError, urllib.error.URLError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in RETRYABLE_MESSAGES)
+
+
+class TokenBucket:
+    """Blocking token bucket: ``rate`` requests per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Take ``tokens``, sleeping until they are available; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class EmbeddingExecutor(Embeddings):
+    """Embeddings wrapper that batches, parallelizes, rate-limits and retries.
+
+    Texts are split into ``batch_size`` batches sent by at most
+    ``max_concurrency`` threads. Every request takes a token from a shared
+    bucket (``requests_per_second``), and quota/transient errors are retried
+    with exponential backoff plus jitter. A retryable error also pauses all
+    workers for the backoff delay so the provider sees real backpressure.
+    """
+
+    def __init__(self, underlying, batch_size=None, max_concurrency=None,
+                 requests_per_second=None, max_retries=None, base_delay=1.0, max_delay=60.0):
+        self.underlying = underlying
+        self.batch_size = batch_size or int(os.getenv("FINVEST_EMBED_BATCH_SIZE", "64"))
+        self.max_concurrency = max_concurrency or int(os.getenv("FINVEST_EMBED_CONCURRENCY", "4"))
+        rps = requests_per_second if requests_per_second is not None else \
+            float(os.getenv("FINVEST_EMBED_RPS", "10"))
+        self.bucket = TokenBucket(rps) if rps > 0 else None
+        self.max_retries = max_retries if max_retries is not None else \
+            int(os.getenv("FINVEST_EMBED_MAX_RETRIES", "5"))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                        thread_name_prefix="embed")
+        self._lock = threading.Lock()
+        self._cooldown_until = 0.0
+        self.counters = {
+            "requests": 0, "texts": 0, "retries": 0, "failures": 0,
+            "throttle_wait_s": 0.0, "busy_s": 0.0,
+        }
+
+    def _count(self, **amounts):
+        with self._lock:
+            for key, amount in amounts.items():
+                self.counters[key] += amount
+
+    def _call(self, fn, payload, size):
+        attempt = 0
+        while True:
+            cooldown = self._cooldown_until - time.monotonic()
+            waited = 0.0
+            if cooldown > 0:
+                time.sleep(cooldown)
+                waited += cooldown
+            if self.bucket:
+                waited += self.bucket.acquire()
+            start = time.perf_counter()
+            try:
+                result = fn(payload)
+                self._count(requests=1, texts=size, throttle_wait_s=waited,
+                            busy_s=time.perf_counter() - start)
+                return result
+            except Exception as e:
+                self._count(requests=1, throttle_wait_s=waited,
+                            busy_s=time.perf_counter() - start)
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._count(failures=1)
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+                with self._lock:
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+                self._count(retries=1)
+                print(f"Embedding request failed ({e}); retry {attempt + 1} in {delay:.1f}s")
+                attempt += 1
+
+    def embed_documents(self, texts):
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) <= 1:
+            return self._call(self.underlying.embed_documents, texts, len(texts)) if texts else []
+        futures = [
+            self._pool.submit(self._call, self.underlying.embed_documents, batch, len(batch))
+            for batch in batches
+        ]
+        vectors = []
+        for future in futures:
+            vectors.extend(future.result())
+        return vectors
+
+    def embed_query(self, text):
+        return self._call(self.underlying.embed_query, text, 1)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats["texts_per_busy_s"] = stats["texts"] / stats["busy_s"] if stats["busy_s"] else 0.0
+        stats.update(batch_size=self.batch_size, max_concurrency=self.max_concurrency,
+                     requests_per_second=self.bucket.rate if self.bucket else None)
+        return stats
+
+
+class HttpEmbeddings(Embeddings):
+    """Client for a plain JSON embedding endpoint (e.g. the local fake server below).
+
+    POST ``{"texts": [...]}`` -> ``{"embeddings": [[...], ...]}``
+    """
+
+    def __init__(self, url, timeout=30):
+        self.url = url
+        self.model = url
+        self.timeout = timeout
+
+    def embed_documents(self, texts):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"texts": list(texts)}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())["embeddings"]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def serve_fake_embeddings(port=8765, size=768, fail_rate=0.0, latency=0.05):
+    """Local stand-in embedding server for exercising batching, rate limits and retries.
+
+    Returns deterministic vectors per text; ``fail_rate`` of requests get a 429.
+    """
+    import hashlib
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    import numpy as np
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            if random.random() < fail_rate:
+                self.send_response(429)
+                self.end_headers()
+                return
+            vectors = []
+            for text in body["texts"]:
+                seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+                vectors.append(np.random.default_rng(seed).normal(size=size).tolist())
+            payload = json.dumps({"embeddings": vectors}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    print(f"Fake embedding server on http://127.0.0.1:{port} (fail_rate={fail_rate})")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    serve_fake_embeddings(
+        port=int(os.getenv("FINVEST_FAKE_EMBED_PORT", "8765")),
+        fail_rate=float(os.getenv("FINVEST_FAKE_EMBED_FAIL_RATE", "0.1")),
+    )
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+import faiss
+from langchain_community.vectorstores import FAISS
+
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "cache", "indexes")
+
+# Flat indexes are only memory-mapped with IO_FLAG_MMAP_IFC (faiss >= 1.9)
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+
+def document_hash(content, model_name):
+    """Key for a document's index: the vectors depend on both content and model.
+
+    ``content`` is the document text, or the raw bytes of an uploaded file.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class IndexStore:
+    """On-disk FAISS indexes, one per document hash, plus session manifests.
+
+    Layout (compatible with ``FAISS.load_local(..., index_name="index")``)::
+
+        <root>/documents/<doc_hash>/index.faiss   raw faiss index
+        <root>/documents/<doc_hash>/index.pkl     (docstore, index_to_docstore_id)
+        <root>/sessions/<session_id>.json         ordered list of doc hashes
+
+    Indexes are loaded lazily and memory-mapped read-only, so keeping many
+    documents on disk costs page cache rather than process heap.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.getenv("FINVEST_INDEX_DIR", DEFAULT_INDEX_DIR)
+        self.documents_dir = os.path.join(self.root, "documents")
+        self.sessions_dir = os.path.join(self.root, "sessions")
+        os.makedirs(self.documents_dir, exist_ok=True)
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _document_dir(self, doc_hash):
+        return os.path.join(self.documents_dir, doc_hash)
+
+    def _session_path(self, session_id):
+        safe_id = hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.sessions_dir, f"{safe_id}.json")
+
+    def exists(self, doc_hash):
+        return os.path.exists(os.path.join(self._document_dir(doc_hash), "index.pkl"))
+
+    def save(self, doc_hash, vectorstore):
+        """Write the index atomically (temp dir + rename) so readers never see a partial file"""
+        target = self._document_dir(doc_hash)
+        if os.path.exists(target):
+            return
+        tmp_dir = tempfile.mkdtemp(dir=self.documents_dir, prefix=".tmp-")
+        try:
+            faiss.write_index(vectorstore.index, os.path.join(tmp_dir, "index.faiss"))
+            with open(os.path.join(tmp_dir, "index.pkl"), "wb") as f:
+                pickle.dump((vectorstore.docstore, vectorstore.index_to_docstore_id), f)
+            os.replace(tmp_dir, target)
+        except OSError:
+            # Another worker saved the same document first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not self.exists(doc_hash):
+                raise
+
+    def load(self, doc_hash, embeddings):
+        """Memory-map a saved index; returns None if the document was never saved"""
+        if not self.exists(doc_hash):
+            return None
+        folder = self._document_dir(doc_hash)
+        index = faiss.read_index(os.path.join(folder, "index.faiss"), MMAP_FLAGS)
+        with open(os.path.join(folder, "index.pkl"), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+    def session_documents(self, session_id):
+        path = self._session_path(session_id)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)["documents"]
+
+    def record_session_document(self, session_id, doc_hash):
+        with self._lock:
+            documents = self.session_documents(session_id)
+            if doc_hash in documents:
+                return
+            documents.append(doc_hash)
+            tmp_path = self._session_path(session_id) + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"session_id": session_id, "documents": documents}, f)
+            os.replace(tmp_path, self._session_path(session_id))
+
+    def stats(self):
+        return {
+            "root": self.root,
+            "documents": sum(1 for name in os.listdir(self.documents_dir)
+                             if not name.startswith(".")),
+        }
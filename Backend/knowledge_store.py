@@ -0,0 +1,254 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import faiss
+from langchain_community.vectorstores import FAISS
+from langchain.chains import ConversationalRetrievalChain
+from langchain.chains.conversational_retrieval.prompts import CONDENSE_QUESTION_PROMPT
+from langchain.chains.question_answering.stuff_prompt import PROMPT_SELECTOR
+from langchain.memory import ConversationBufferWindowMemory
+
+
+DEFAULT_SESSION = "default"
+
+
+def owned_copy(index):
+    """Heap copy of a (possibly memory-mapped) faiss index.
+
+    ``faiss.clone_index`` keeps viewing the mapped buffer; a serialize
+    round-trip gives an index that owns its vectors and can be modified.
+    """
+    return faiss.deserialize_index(faiss.serialize_index(index))
+
+
+class SessionKnowledgeBase:
+    """FAISS index, bounded chat memory and QA chain for one session.
+
+    Documents are appended to the existing index with ``add_documents`` (or
+    merged in as prebuilt per-document indexes with ``add_vectorstore``) so a
+    second upload only adds the new chunks instead of rebuilding everything.
+    """
+
+    def __init__(self, session_id, embeddings, llm, memory_window=10):
+        self.session_id = session_id
+        self.embeddings = embeddings
+        self.llm = llm
+        self.vectorstore = None
+        self.qa_chain = None
+        self.memory = ConversationBufferWindowMemory(
+            k=memory_window,
+            memory_key="chat_history",
+            return_messages=True,
+            input_key="question",
+            output_key="answer"
+        )
+        self.document_count = 0
+        self.document_hashes = set()
+        self.text_bytes = 0
+        # True while self.vectorstore wraps a read-only (memory-mapped) index
+        self._read_only = False
+        # Serializes index updates and chain calls (memory is not thread-safe)
+        self.lock = threading.RLock()
+
+    def _attach(self, vectorstore):
+        self.vectorstore = vectorstore
+        self.qa_chain = ConversationalRetrievalChain.from_llm(
+            llm=self.llm,
+            retriever=self.vectorstore.as_retriever(),
+            memory=self.memory,
+            return_source_documents=True,
+            verbose=True
+        )
+
+    def _make_writable(self):
+        if self._read_only:
+            self.vectorstore.index = owned_copy(self.vectorstore.index)
+            self._read_only = False
+
+    def add_documents(self, documents):
+        with self.lock:
+            if self.vectorstore is None:
+                self._attach(FAISS.from_documents(documents, self.embeddings))
+            else:
+                self._make_writable()
+                self.vectorstore.add_documents(documents)
+            self.document_count += 1
+            self.text_bytes += sum(len(doc.page_content.encode("utf-8")) for doc in documents)
+
+    def add_vectorstore(self, vectorstore, doc_hash=None, read_only=False):
+        """Add a prebuilt per-document index without re-embedding its chunks.
+
+        The first index is adopted as-is (a memory-mapped one stays on disk);
+        it is copied into memory only when a second document has to be merged.
+        Returns False if the document is already part of this session.
+        """
+        with self.lock:
+            if doc_hash is not None and doc_hash in self.document_hashes:
+                return False
+            if self.vectorstore is None:
+                self._attach(vectorstore)
+                self._read_only = read_only
+            else:
+                self._make_writable()
+                if read_only:
+                    # merge_from empties its source, which a mapped index cannot do
+                    vectorstore = FAISS(self.embeddings, owned_copy(vectorstore.index),
+                                        vectorstore.docstore, vectorstore.index_to_docstore_id)
+                self.vectorstore.merge_from(vectorstore)
+            if doc_hash is not None:
+                self.document_hashes.add(doc_hash)
+            self.document_count += 1
+            self.text_bytes += sum(
+                len(vectorstore.docstore.search(doc_id).page_content.encode("utf-8"))
+                for doc_id in vectorstore.index_to_docstore_id.values()
+            )
+            return True
+
+    @property
+    def fingerprint(self):
+        """Identifies the set of documents behind this session's index"""
+        digest = hashlib.sha256()
+        for doc_hash in sorted(self.document_hashes):
+            digest.update(doc_hash.encode("ascii"))
+        # Documents added without a hash only show up in the count
+        digest.update(str(self.document_count).encode("ascii"))
+        return digest.hexdigest()
+
+    @property
+    def nbytes(self):
+        """Approximate resident size: float32 vectors plus chunk text"""
+        if self.vectorstore is None:
+            return 0
+        index = self.vectorstore.index
+        return index.ntotal * index.d * 4 + self.text_bytes
+
+    def invoke(self, inputs):
+        with self.lock:
+            return self.qa_chain.invoke(inputs)
+
+    def stream(self, question):
+        """Token-streaming equivalent of ``invoke`` for a single question.
+
+        Mirrors the retrieval chain (condense the follow-up with chat history,
+        retrieve, stuff the context into the QA prompt) but streams the final
+        LLM call. Yields ``("token", text)`` pieces, then ``("sources", docs)``.
+        The lock is only held to read and update the session, not while
+        tokens are sent, so a slow client does not block other requests.
+        """
+        with self.lock:
+            history = self.memory.load_memory_variables({})["chat_history"]
+            standalone = question
+            if history:
+                transcript = "\n".join(
+                    f"{'Human' if message.type == 'human' else 'Assistant'}: {message.content}"
+                    for message in history
+                )
+                standalone = self.llm.invoke(CONDENSE_QUESTION_PROMPT.format(
+                    chat_history=transcript, question=question)).content
+            docs = self.vectorstore.as_retriever().get_relevant_documents(standalone)
+        messages = PROMPT_SELECTOR.get_prompt(self.llm).format_messages(
+            context="\n\n".join(doc.page_content for doc in docs),
+            question=standalone
+        )
+        parts = []
+        for chunk in self.llm.stream(messages):
+            parts.append(chunk.content)
+            yield "token", chunk.content
+        self.save_turn(question, "".join(parts))
+        yield "sources", docs
+
+    def save_turn(self, question, answer):
+        with self.lock:
+            self.memory.save_context({"question": question}, {"answer": answer})
+
+
+class KnowledgeStore:
+    """Session-keyed knowledge bases with LRU eviction under a memory budget"""
+
+    def __init__(self, max_bytes=None, max_sessions=None, memory_window=None):
+        self.max_bytes = max_bytes if max_bytes is not None else \
+            int(float(os.getenv("FINVEST_KB_MAX_MB", "512")) * 1024 * 1024)
+        self.max_sessions = max_sessions if max_sessions is not None else \
+            int(os.getenv("FINVEST_KB_MAX_SESSIONS", "100"))
+        self.memory_window = memory_window if memory_window is not None else \
+            int(os.getenv("FINVEST_MEMORY_WINDOW", "10"))
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, session_id):
+        """Return the session's knowledge base (marking it recently used) or None"""
+        with self._lock:
+            kb = self._sessions.get(session_id)
+            if kb is not None:
+                self._sessions.move_to_end(session_id)
+            return kb
+
+    def get_or_create(self, session_id, embeddings, llm):
+        with self._lock:
+            kb = self._sessions.get(session_id)
+            if kb is None:
+                kb = SessionKnowledgeBase(session_id, embeddings, llm, self.memory_window)
+                self._sessions[session_id] = kb
+            self._sessions.move_to_end(session_id)
+            return kb
+
+    def add_documents(self, session_id, documents, embeddings, llm):
+        kb = self.get_or_create(session_id, embeddings, llm)
+        kb.add_documents(documents)
+        self._enforce_budget(keep=session_id)
+        return kb
+
+    def add_vectorstore(self, session_id, doc_hash, vectorstore, embeddings, llm, read_only=False):
+        kb = self.get_or_create(session_id, embeddings, llm)
+        kb.add_vectorstore(vectorstore, doc_hash, read_only=read_only)
+        self._enforce_budget(keep=session_id)
+        return kb
+
+    def restore(self, session_id, index_store, embeddings, llm):
+        """Rebuild a session that was evicted or lost in a restart from the
+        document indexes persisted for it; returns None if it has none."""
+        doc_hashes = index_store.session_documents(session_id)
+        if not doc_hashes:
+            return None
+        kb = self.get_or_create(session_id, embeddings, llm)
+        with kb.lock:
+            for doc_hash in doc_hashes:
+                if doc_hash in kb.document_hashes:
+                    continue
+                vectorstore = index_store.load(doc_hash, embeddings)
+                if vectorstore is not None:
+                    kb.add_vectorstore(vectorstore, doc_hash, read_only=True)
+        if kb.vectorstore is None:
+            self.drop(session_id)
+            return None
+        self._enforce_budget(keep=session_id)
+        return kb
+
+    def drop(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _enforce_budget(self, keep):
+        with self._lock:
+            while len(self._sessions) > 1 and (
+                    len(self._sessions) > self.max_sessions or
+                    sum(kb.nbytes for kb in self._sessions.values()) > self.max_bytes):
+                oldest = next(iter(self._sessions))
+                if oldest == keep:
+                    break
+                evicted = self._sessions.pop(oldest)
+                self.evictions += 1
+                print(f"Evicted knowledge base for session {evicted.session_id} "
+                      f"({evicted.nbytes / 1e6:.1f} MB)")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": sum(kb.nbytes for kb in self._sessions.values()),
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
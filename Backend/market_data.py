@@ -0,0 +1,220 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, time as dtime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+
+DEFAULT_MARKET_DATA_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      "cache", "market_data.sqlite")
+DEFAULT_SAMPLE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "sample_stock_data.csv")
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def last_market_close(now):
+    """Most recent regular-session close (16:00 New York) at or before ``now``.
+
+    Exchange holidays are not modelled; on a holiday the store just re-fetches
+    once and gets no new bar.
+    """
+    local = now.astimezone(MARKET_TZ)
+    day = local.date()
+    if local.time() < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return datetime.combine(day, MARKET_CLOSE, tzinfo=MARKET_TZ)
+
+
+def market_is_open(now):
+    local = now.astimezone(MARKET_TZ)
+    return local.weekday() < 5 and MARKET_OPEN <= local.time() < MARKET_CLOSE
+
+
+def as_of_clock(day):
+    """Clock pinned to the close of ``day`` (YYYY-MM-DD), e.g. to replay a CSV"""
+    if not day:
+        return None
+    pinned = datetime.combine(date.fromisoformat(day), MARKET_CLOSE, tzinfo=MARKET_TZ)
+    return lambda: pinned
+
+
+class YahooProvider:
+    """Daily bars from Yahoo Finance"""
+
+    name = "yahoo"
+
+    def fetch(self, symbol, start, end):
+        """Bars for ``start <= date <= end`` as a frame indexed by date"""
+        import yfinance as yf
+        hist = yf.Ticker(symbol).history(start=start.isoformat(),
+                                         end=(end + timedelta(days=1)).isoformat())
+        if hist.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        hist.index = pd.to_datetime(hist.index).tz_localize(None).normalize()
+        return hist[OHLCV_COLUMNS]
+
+
+class CsvProvider:
+    """Daily bars from a local CSV (``Date`` plus OHLCV columns), for offline runs.
+
+    If the file has a ``ticker`` column rows are filtered by symbol, otherwise
+    every symbol gets the same series.
+    """
+
+    name = "csv"
+
+    def __init__(self, path=DEFAULT_SAMPLE_CSV):
+        self.path = path
+        self.data = pd.read_csv(path, parse_dates=["Date"])
+
+    def fetch(self, symbol, start, end):
+        data = self.data
+        if "ticker" in data.columns:
+            data = data[data["ticker"] == symbol]
+        dates = data["Date"].dt.date
+        data = data[(dates >= start) & (dates <= end)]
+        return data.set_index("Date")[OHLCV_COLUMNS]
+
+
+PROVIDERS = {
+    "yahoo": YahooProvider,
+    "csv": lambda: CsvProvider(os.getenv("FINVEST_MARKET_DATA_CSV", DEFAULT_SAMPLE_CSV)),
+}
+
+
+class MarketDataStore:
+    """Local OHLCV store in front of a market-data provider.
+
+    Bars are kept in SQLite together with the date range each symbol has been
+    fetched for. A request for the last ``days`` only goes to the provider for
+    the part of that range not covered yet, plus a refresh of the most recent
+    bars once they are stale: after the next market close, or every
+    ``intraday_ttl`` seconds while the market is open.
+    """
+
+    def __init__(self, provider=None, path=None, intraday_ttl=None, now_fn=None):
+        self.provider = provider or PROVIDERS[os.getenv("FINVEST_MARKET_DATA_PROVIDER", "yahoo")]()
+        self.path = path or os.getenv("FINVEST_MARKET_DATA_DB", DEFAULT_MARKET_DATA_DB)
+        self.intraday_ttl = intraday_ttl if intraday_ttl is not None else \
+            float(os.getenv("FINVEST_MARKET_DATA_TTL", "900"))
+        self.now_fn = now_fn or as_of_clock(os.getenv("FINVEST_MARKET_DATA_AS_OF")) or \
+            (lambda: datetime.now(MARKET_TZ))
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bars (symbol TEXT, date TEXT, open REAL, high REAL, "
+            "low REAL, close REAL, volume REAL, PRIMARY KEY (symbol, date))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS coverage (symbol TEXT PRIMARY KEY, start TEXT, "
+            "end TEXT, fetched_at REAL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._symbol_locks = {}
+        self.counters = {"requests": 0, "cache_hits": 0, "provider_calls": 0, "bars_fetched": 0}
+
+    def _symbol_lock(self, symbol):
+        with self._lock:
+            return self._symbol_locks.setdefault(symbol, threading.Lock())
+
+    def _coverage(self, symbol):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT start, end, fetched_at FROM coverage WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        if row is None:
+            return None
+        return date.fromisoformat(row[0]), date.fromisoformat(row[1]), row[2]
+
+    def _is_stale(self, fetched_at, now):
+        fetched = datetime.fromtimestamp(fetched_at, tz=MARKET_TZ)
+        if fetched < last_market_close(now):
+            return True
+        return market_is_open(now) and (now - fetched).total_seconds() > self.intraday_ttl
+
+    def _fetch(self, symbol, start, end):
+        bars = self.provider.fetch(symbol, start, end)
+        rows = [
+            (symbol, pd.Timestamp(day).strftime("%Y-%m-%d"),
+             float(bar.Open), float(bar.High), float(bar.Low), float(bar.Close), float(bar.Volume))
+            for day, bar in zip(bars.index, bars.itertuples(index=False))
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+            self.counters["provider_calls"] += 1
+            self.counters["bars_fetched"] += len(rows)
+
+    def _set_coverage(self, symbol, start, end, fetched_at):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?)",
+                (symbol, start.isoformat(), end.isoformat(), fetched_at)
+            )
+            self._conn.commit()
+
+    def history(self, symbol, days):
+        """Daily bars for the last ``days`` calendar days.
+
+        Returns the same shape as ``yf.Ticker(symbol).history(...).reset_index()``:
+        a ``Date`` column followed by Open/High/Low/Close/Volume.
+        """
+        symbol = symbol.upper()
+        now = self.now_fn()
+        today = now.astimezone(MARKET_TZ).date()
+        start = today - timedelta(days=days)
+
+        with self._symbol_lock(symbol):
+            coverage = self._coverage(symbol)
+            fetched = False
+            if coverage is None:
+                self._fetch(symbol, start, today)
+                self._set_coverage(symbol, start, today, now.timestamp())
+                fetched = True
+            else:
+                covered_start, covered_end, fetched_at = coverage
+                if start < covered_start:
+                    self._fetch(symbol, start, covered_start - timedelta(days=1))
+                    covered_start = start
+                    fetched = True
+                if self._is_stale(fetched_at, now):
+                    # Re-fetch the last covered day too: its bar may have been partial
+                    self._fetch(symbol, covered_end, today)
+                    covered_end, fetched_at = today, now.timestamp()
+                    fetched = True
+                elif covered_end < today:
+                    # Nothing has traded since the last fetch (e.g. a weekend)
+                    covered_end = today
+                if fetched or covered_end != coverage[1]:
+                    self._set_coverage(symbol, covered_start, covered_end, fetched_at)
+
+        with self._lock:
+            self.counters["requests"] += 1
+            if not fetched:
+                self.counters["cache_hits"] += 1
+            rows = self._conn.execute(
+                "SELECT date, open, high, low, close, volume FROM bars "
+                "WHERE symbol = ? AND date >= ? AND date <= ? ORDER BY date",
+                (symbol, start.isoformat(), today.isoformat())
+            ).fetchall()
+        hist = pd.DataFrame(rows, columns=["Date"] + OHLCV_COLUMNS)
+        hist["Date"] = pd.to_datetime(hist["Date"])
+        return hist
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["symbols"] = self._conn.execute("SELECT COUNT(*) FROM coverage").fetchone()[0]
+            stats["bars"] = self._conn.execute("SELECT COUNT(*) FROM bars").fetchone()[0]
+        stats.update(provider=self.provider.name, path=self.path)
+        return stats
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from embedding_cache import CachedEmbeddings, EmbeddingCache
+from embedding_executor import EmbeddingExecutor, HttpEmbeddings
+
+
+# Model settings used by the Flask backend
+EMBEDDING_MODEL = "models/embedding-001"
+CHAT_MODEL = "gemini-2.0-flash"
+DEFAULT_EMBEDDING_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       "cache", "embeddings.sqlite")
+
+
+def _google_embeddings():
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    return GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
+
+
+def _google_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model=CHAT_MODEL,
+        convert_system_message_to_human=True,
+        temperature=0.7,
+        top_p=0.95,
+        top_k=40,
+    )
+
+
+def _fake_embeddings():
+    """Deterministic local embeddings (no network) for tests and offline runs"""
+    from langchain_community.embeddings import DeterministicFakeEmbedding
+    return DeterministicFakeEmbedding(size=int(os.getenv("FINVEST_FAKE_EMBEDDING_SIZE", "768")))
+
+
+def _fake_llm():
+    """Canned local chat model (no network) for tests and offline runs"""
+    from langchain_community.chat_models.fake import FakeListChatModel
+    return FakeListChatModel(responses=[
+        os.getenv("FINVEST_FAKE_LLM_RESPONSE", "This is a local test answer.")
+    ])
+
+
+def _http_embeddings():
+    """Embeddings from a local JSON endpoint, e.g. ``python embedding_executor.py``"""
+    return HttpEmbeddings(os.getenv("FINVEST_EMBEDDINGS_URL", "http://127.0.0.1:8765"))
+
+
+BACKENDS = {
+    "google": (_google_embeddings, _google_llm),
+    "fake": (_fake_embeddings, _fake_llm),
+    "http": (_http_embeddings, _fake_llm),
+}
+
+
+class ModelRegistry:
+    """Process-wide holder for the embedding and chat model clients.
+
+    Clients are built lazily on first use (or eagerly via ``warm_up``) and then
+    shared by every request thread. Construction is guarded by a lock so that
+    concurrent first requests build each client exactly once.
+    """
+
+    def __init__(self, backend=None):
+        load_dotenv()
+        self._lock = threading.Lock()
+        self._backend = backend
+        self._embeddings = None
+        self._llm = None
+        self.embedding_model_name = None
+        self.embedding_executor = None
+        self.timings = {}
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = os.getenv("FINVEST_MODEL_BACKEND", "google")
+        if self._backend not in BACKENDS:
+            raise ValueError(f"Unknown model backend: {self._backend}")
+        return self._backend
+
+    def configure(self, backend):
+        """Switch backend (e.g. 'fake' in tests); drops any built clients"""
+        with self._lock:
+            self._backend = backend
+            self._embeddings = None
+            self._llm = None
+            self.embedding_executor = None
+            self.timings = {}
+
+    def _build(self, index, name):
+        start = time.perf_counter()
+        client = BACKENDS[self.backend][index]()
+        self.timings[f"{name}_construct_s"] = time.perf_counter() - start
+        return client
+
+    def _wrap(self, embeddings):
+        """Put batching/rate limiting and the content-addressed chunk cache in
+        front of the provider (cache -> executor -> provider).
+
+        FINVEST_EMBEDDING_CACHE sets the SQLite path; an empty value disables it.
+        """
+        model_name = getattr(embeddings, "model", None) or \
+            f"{type(embeddings).__name__}-{getattr(embeddings, 'size', '')}"
+        self.embedding_model_name = f"{self.backend}:{model_name}"
+        self.embedding_executor = EmbeddingExecutor(embeddings)
+        path = os.getenv("FINVEST_EMBEDDING_CACHE", DEFAULT_EMBEDDING_CACHE)
+        if not path:
+            return self.embedding_executor
+        return CachedEmbeddings(self.embedding_executor, EmbeddingCache(path),
+                                self.embedding_model_name)
+
+    def get_embeddings(self):
+        if self._embeddings is None:
+            with self._lock:
+                if self._embeddings is None:
+                    self._embeddings = self._wrap(self._build(0, "embeddings"))
+        return self._embeddings
+
+    def get_llm(self):
+        if self._llm is None:
+            with self._lock:
+                if self._llm is None:
+                    self._llm = self._build(1, "llm")
+        return self._llm
+
+    def get_models(self):
+        return self.get_embeddings(), self.get_llm()
+
+    def warm_up(self, probe=False):
+        """Build both clients now; with ``probe`` also make one tiny call each
+        so connection setup and auth happen before the first user request."""
+        start = time.perf_counter()
+        embeddings, llm = self.get_models()
+        if probe:
+            probe_start = time.perf_counter()
+            embeddings.embed_query("warm up")
+            self.timings["embeddings_probe_s"] = time.perf_counter() - probe_start
+            probe_start = time.perf_counter()
+            llm.invoke("Reply with OK.")
+            self.timings["llm_probe_s"] = time.perf_counter() - probe_start
+        self.timings["warm_up_s"] = time.perf_counter() - start
+        return self.timings
+
+    def stats(self):
+        stats = {
+            "backend": self.backend,
+            "embeddings_loaded": self._embeddings is not None,
+            "llm_loaded": self._llm is not None,
+            "timings": dict(self.timings),
+        }
+        if isinstance(self._embeddings, CachedEmbeddings):
+            stats["embedding_cache"] = self._embeddings.stats()
+        if self.embedding_executor is not None:
+            stats["embedding_executor"] = self.embedding_executor.stats()
+        return stats
+
+
+registry = ModelRegistry()
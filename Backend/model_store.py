@@ -0,0 +1,162 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+import joblib
+
+
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "cache", "models")
+MODEL_FILE = "model.joblib"
+META_FILE = "meta.json"
+# Model names become directory names under the store root
+MODEL_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._\-]{0,63}")
+
+
+class ModelStore:
+    """Versioned on-disk store of trained predictors.
+
+    Layout::
+
+        <root>/<name>/v0001/<model_file>   the pickled predictor (uncompressed)
+        <root>/<name>/v0001/meta.json      fingerprint, feature columns, metrics
+
+    Each save of a model trained on different data (or hyperparameters)
+    becomes a new version; saving a fingerprint that is already stored is a
+    no-op. The latest version of each name is loaded once and kept warm in
+    memory; serving only lists the name's version directories to pick up a
+    version saved by another process (e.g. a rerun of ``ISC.py``). Each
+    process holds its own copy: sklearn's tree estimators copy their node
+    arrays on unpickling, so memory-mapping the file would not share them.
+    """
+
+    def __init__(self, root=None, model_file=MODEL_FILE):
+        self.root = root or os.getenv("FINVEST_MODEL_DIR", DEFAULT_MODEL_DIR)
+        self.model_file = model_file
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._warm = {}
+        self.counters = {"loads": 0, "warm_hits": 0, "saves": 0}
+
+    def _model_dir(self, name):
+        """Directory of ``name``; ValueError unless it is a plain name directly under the root"""
+        if not isinstance(name, str) or not MODEL_NAME_RE.fullmatch(name):
+            raise ValueError(f"Invalid model name: {name!r}")
+        root = os.path.realpath(self.root)
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.dirname(path) != root:
+            raise ValueError(f"Invalid model name: {name!r}")
+        return path
+
+    def versions(self, name):
+        model_dir = self._model_dir(name)
+        if not os.path.isdir(model_dir):
+            return []
+        return sorted(int(entry[1:]) for entry in os.listdir(model_dir)
+                      if entry.startswith("v") and entry[1:].isdigit())
+
+    def metadata(self, name, version=None):
+        versions = self.versions(name)
+        if not versions:
+            return None
+        version = version or versions[-1]
+        path = os.path.join(self._model_dir(name), f"v{version:04d}", META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def find(self, name, fingerprint):
+        """Version of ``name`` trained with this fingerprint, or None"""
+        for version in reversed(self.versions(name)):
+            meta = self.metadata(name, version)
+            if meta and meta["fingerprint"] == fingerprint:
+                return version
+        return None
+
+    def save(self, name, predictor, fingerprint, feature_cols, metrics=None):
+        """Store ``predictor`` as the next version of ``name``; returns the version"""
+        with self._lock:
+            existing = self.find(name, fingerprint)
+            if existing is not None:
+                return existing
+            model_dir = self._model_dir(name)
+            os.makedirs(model_dir, exist_ok=True)
+            versions = self.versions(name)
+            version = versions[-1] + 1 if versions else 1
+            meta = {
+                "name": name,
+                "version": version,
+                "fingerprint": fingerprint,
+                "feature_cols": list(feature_cols),
+                "metrics": metrics or {},
+                "created_at": time.time(),
+            }
+            # Write into a temp dir and rename so readers never see a partial version
+            tmp_dir = tempfile.mkdtemp(dir=model_dir, prefix=".tmp-")
+            try:
+                # Uncompressed: loading skips the decompression pass
+                joblib.dump(predictor, os.path.join(tmp_dir, self.model_file))
+                with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+                    json.dump(meta, f, indent=2, default=float)
+                os.replace(tmp_dir, os.path.join(model_dir, f"v{version:04d}"))
+            except Exception:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+            self.counters["saves"] += 1
+            self._warm.pop(name, None)
+            return version
+
+    def load(self, name, version=None):
+        """Load ``(predictor, meta)`` from disk; version defaults to the latest"""
+        meta = self.metadata(name, version)
+        if meta is None:
+            return None, None
+        path = os.path.join(self._model_dir(name), f"v{meta['version']:04d}", self.model_file)
+        predictor = joblib.load(path)
+        with self._lock:
+            self.counters["loads"] += 1
+        return predictor, meta
+
+    def get(self, name):
+        """Latest ``(predictor, meta)`` for ``name``, kept in memory until a newer version is saved"""
+        versions = self.versions(name)
+        with self._lock:
+            warm = self._warm.get(name)
+            if warm is not None and versions and warm[1]["version"] == versions[-1]:
+                self.counters["warm_hits"] += 1
+                return warm
+            self._warm.pop(name, None)
+        if not versions:
+            return None, None
+        predictor, meta = self.load(name, versions[-1])
+        if predictor is None:
+            return None, None
+        with self._lock:
+            self._warm[name] = (predictor, meta)
+        return predictor, meta
+
+    def names(self):
+        return sorted(entry for entry in os.listdir(self.root)
+                      if MODEL_NAME_RE.fullmatch(entry) and self.versions(entry))
+
+    def warm_up(self, names=None):
+        """Load the latest version of each model so the first request doesn't pay for it"""
+        timings = {}
+        for name in names or self.names():
+            start = time.perf_counter()
+            self.get(name)
+            timings[name] = time.perf_counter() - start
+        return timings
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            warm = {name: meta["version"] for name, (_, meta) in self._warm.items()}
+        stats.update(root=self.root, models={name: self.versions(name)[-1] for name in self.names()},
+                     warm=warm)
+        return stats
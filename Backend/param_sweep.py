@@ -0,0 +1,122 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ISC import (Config, EnhancedStrategy, RunConfig, enhanced_backtest, fit_or_load_strategy,
+                 load_or_generate_data, prepare_enhanced_features, select_feature_cols)
+
+
+# Signal and risk settings swept by default (3^6 = 729 runs)
+DEFAULT_GRID = {
+    'PRED_RETURN_BUY_THRESHOLD': [0.001, 0.003, 0.005],
+    'SENTIMENT_WEIGHT': [0.0, 0.3, 0.6],
+    'CONFIDENCE_THRESHOLD': [0.002, 0.5, 0.9],
+    'MAX_POSITION_SIZE': [0.05, 0.1, 0.2],
+    'STOP_LOSS_PCT': [0.03, 0.05, 0.1],
+    'TAKE_PROFIT_PCT': [0.05, 0.1, 0.2],
+}
+
+# Test-period columns every run needs; set once per worker process
+_scored = None
+
+
+def grid_configs(grid):
+    """One RunConfig per combination of ``grid`` values.
+
+    The sell threshold mirrors the buy threshold unless it is swept itself.
+    """
+    names = list(grid)
+    configs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        overrides = dict(zip(names, values))
+        if 'PRED_RETURN_BUY_THRESHOLD' in overrides and 'PRED_RETURN_SELL_THRESHOLD' not in overrides:
+            overrides['PRED_RETURN_SELL_THRESHOLD'] = -overrides['PRED_RETURN_BUY_THRESHOLD']
+        configs.append((overrides, RunConfig(**overrides)))
+    return configs
+
+
+def score_test_period(strategy, features_df, feature_cols, split_idx):
+    """Predictions for the test rows, computed once and shared by every run"""
+    test_df = features_df.iloc[split_idx:]
+    pred_returns, confidence = strategy.predictor.predict_with_confidence(test_df[feature_cols].values)
+    return pd.DataFrame({
+        'date': test_df['date'].values,
+        'close': test_df['close'].values,
+        'target_next_return': test_df['target_next_return'].values,
+        'sentiment': test_df['sentiment'].values,
+        'confidence': test_df['confidence'].values,
+        'pred_next_return': pred_returns,
+        'pred_confidence': confidence,
+    })
+
+
+def _init_worker(scored):
+    global _scored
+    _scored = scored
+
+
+def evaluate_config(config, scored=None):
+    """Signals and backtest metrics for one config over the cached predictions"""
+    scored = _scored if scored is None else scored
+    signal, final_score, position_size = EnhancedStrategy(config).signal_arrays(
+        scored['pred_next_return'].values, scored['pred_confidence'].values,
+        scored['sentiment'].values, scored['confidence'].values)
+    signals_df = scored[['date', 'close', 'target_next_return']].assign(
+        signal=signal, position_size=position_size)
+    _, metrics = enhanced_backtest(signals_df, config)
+    metrics['trades'] = int(np.isin(signal, ['BUY', 'SELL']).sum())
+    return metrics
+
+
+def _evaluate(task):
+    overrides, config = task
+    return dict(overrides, **evaluate_config(config))
+
+
+def run_sweep(ticker=Config.TARGET_TICKER, grid=None, workers=None, output=None):
+    """Train (or load) the ticker's model once, then backtest every grid combination.
+
+    Predictions are computed once; each run only re-derives signals and
+    re-runs the backtest with its own RunConfig, spread over a process pool.
+    Returns the results table (one row per config, best Sharpe first) and
+    writes it to ``output`` (default ``<ticker>_param_sweep.csv``).
+    """
+    grid = grid or DEFAULT_GRID
+    workers = workers or os.cpu_count() or 1
+    output = output or f"{ticker}_param_sweep.csv"
+
+    market_df, sentiment_df, earnings_df = load_or_generate_data(ticker)
+    features_df = prepare_enhanced_features(market_df, sentiment_df, earnings_df)
+    feature_cols = select_feature_cols(features_df)
+
+    start = time.perf_counter()
+    strategy = EnhancedStrategy()
+    split_idx = fit_or_load_strategy(strategy, ticker, features_df, feature_cols)
+    scored = score_test_period(strategy, features_df, feature_cols, split_idx)
+    train_s = time.perf_counter() - start
+
+    configs = grid_configs(grid)
+    start = time.perf_counter()
+    if workers <= 1:
+        rows = [dict(overrides, **evaluate_config(config, scored)) for overrides, config in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(scored,)) as pool:
+            rows = list(pool.map(_evaluate, configs, chunksize=max(1, len(configs) // (workers * 4))))
+    sweep_s = time.perf_counter() - start
+
+    results = pd.DataFrame(rows).sort_values('strategy_sharpe', ascending=False, kind='stable')
+    results.to_csv(output, index=False)
+    print(f"Model ready in {train_s:.2f}s; {len(configs)} configs backtested in {sweep_s:.2f}s "
+          f"({sweep_s / len(configs) * 1000:.1f}ms each, {workers} workers)")
+    print(f"Results saved to: {output}")
+    return results
+
+
+if __name__ == "__main__":
+    results = run_sweep()
+    print(results.head(10).to_string(index=False))
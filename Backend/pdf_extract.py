@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+
+
+MAX_PDF_PAGES = int(os.getenv("FINVEST_PDF_MAX_PAGES", "1000"))
+MAX_PDF_BYTES = int(float(os.getenv("FINVEST_PDF_MAX_MB", "50")) * 1024 * 1024)
+PDF_WORKERS = int(os.getenv("FINVEST_PDF_WORKERS", str(min(8, os.cpu_count() or 1))))
+# Below this many pages the process pool start-up costs more than it saves
+PARALLEL_MIN_PAGES = 16
+
+
+class PdfTooLargeError(ValueError):
+    pass
+
+
+def read_upload(stream, max_bytes=MAX_PDF_BYTES, block_size=1024 * 1024):
+    """Read an upload in blocks, refusing it as soon as it exceeds ``max_bytes``"""
+    blocks = []
+    total = 0
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        total += len(block)
+        if total > max_bytes:
+            raise PdfTooLargeError(f"PDF exceeds {max_bytes // (1024 * 1024)} MB limit")
+        blocks.append(block)
+    return b"".join(blocks)
+
+
+# Each pool worker parses the PDF once and then extracts the pages it is given
+_worker_reader = None
+
+
+def _init_worker(pdf_bytes):
+    global _worker_reader
+    _worker_reader = PdfReader(BytesIO(pdf_bytes))
+
+
+def _extract_page(page_index):
+    return page_index + 1, _worker_reader.pages[page_index].extract_text() or ""
+
+
+def iter_pdf_pages(pdf_bytes, max_pages=MAX_PDF_PAGES, workers=PDF_WORKERS, chunksize=4):
+    """Yield ``(page_number, text)`` in page order as pages are extracted.
+
+    Large documents are spread across a process pool; because results are
+    yielded in order as they complete, callers can start chunking and
+    embedding the first pages while later ones are still being extracted.
+    """
+    reader = PdfReader(BytesIO(pdf_bytes))
+    page_count = len(reader.pages)
+    if page_count > max_pages:
+        raise PdfTooLargeError(f"PDF has {page_count} pages (limit {max_pages})")
+
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        for page_index, page in enumerate(reader.pages):
+            yield page_index + 1, page.extract_text() or ""
+        return
+
+    pool = ProcessPoolExecutor(max_workers=min(workers, page_count),
+                               initializer=_init_worker,
+                               initargs=(pdf_bytes,))
+    try:
+        yield from pool.map(_extract_page, range(page_count), chunksize=chunksize)
+    finally:
+        # If the consumer stops early (e.g. a cancelled job) drop queued pages
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from ISC import Config
+
+
+SIGNAL_DIRECTIONS = {'BUY': 1, 'SELL': -1}
+
+
+def signal_matrices(signals_df):
+    """Pivot long per-ticker signal rows (date, ticker, close, signal, position_size) to date x ticker"""
+    wide = signals_df.pivot(index='date', columns='ticker')
+    return wide['close'], wide['signal'], wide['position_size']
+
+
+def _directions(signal):
+    """+1 / -1 / 0 per cell from BUY/SELL/HOLD strings (or already numeric signals)"""
+    signal = np.asarray(signal)
+    if signal.dtype.kind in 'fiub':
+        return np.sign(np.nan_to_num(signal)).astype(np.int8)
+    directions = np.zeros(signal.shape, dtype=np.int8)
+    for name, value in SIGNAL_DIRECTIONS.items():
+        directions[signal == name] = value
+    return directions
+
+
+def _carry_forward(values, mask, carry):
+    """Last ``values`` row where ``mask`` was set, per column; ``carry`` before the first one"""
+    rows = np.arange(len(values))[:, None]
+    last = np.maximum.accumulate(np.where(mask, rows, -1), axis=0)
+    taken = np.take_along_axis(values, np.maximum(last, 0), axis=0)
+    return np.where(last >= 0, taken, carry)
+
+
+def target_weights(directions, size, last_side, last_weight):
+    """Weights held after each date for one chunk of dates.
+
+    Same position rules as the single-asset backtest: a signal is taken
+    unless the book already holds that side (the sign of the weight
+    carried in), BUY going to ``size`` and SELL to ``-|size|``. A signal
+    with zero size leaves the book flat, so the next signal either way
+    re-enters. Returns the weights and the side / weight to carry into
+    the next chunk.
+    """
+    event = directions != 0
+    signed_size = np.where(directions > 0, size, -np.abs(size))
+    sized = event & (signed_size != 0)
+    # Side of the latest sized signal; taken or not, the book is on that side afterwards
+    side = _carry_forward(np.sign(signed_size).astype(np.int8), sized, last_side)
+    side_before = np.vstack([last_side[None, :], side[:-1]])
+    # A zero-size signal against that side flattens the book until the next sized one
+    flattening = event & ~sized & (directions != side_before)
+    rows = np.arange(len(directions))[:, None]
+    last_flattening = np.maximum.accumulate(np.where(flattening, rows, -1), axis=0)
+    last_sized = np.maximum.accumulate(np.where(sized, rows, -1), axis=0)
+    held = np.where(last_flattening > last_sized, 0, side).astype(np.int8)
+
+    held_before = np.vstack([last_side[None, :], held[:-1]])
+    accepted = event & (directions != held_before)
+    weights = _carry_forward(signed_size, accepted, last_weight)
+    return weights, held[-1], weights[-1]
+
+
+def portfolio_backtest(close, signal, size, config=Config, cost_bps=0.0, chunk_days=2520,
+                       return_weights=False):
+    """Backtest a basket from aligned date x ticker close / signal / position-size frames.
+
+    Each name's weight follows its signals (see ``target_weights``), is
+    clipped to ``MAX_POSITION_SIZE`` and the whole book is scaled down when
+    gross exposure exceeds ``MAX_GROSS_EXPOSURE``; weights are held from one
+    close to the next and rebalanced daily. Names without a price hold
+    nothing. Stop losses / take profits are not applied at portfolio level.
+
+    Dates are processed in chunks of ``chunk_days`` with the positions carried
+    across, so memory stays at a few chunk-sized arrays however long the
+    history. Returns ``(results_df, metrics)``, plus the weight matrix with
+    ``return_weights``.
+    """
+    dates, tickers = close.index, close.columns
+    prices = close.to_numpy(dtype=np.float64)
+    directions_all = signal.reindex(index=dates, columns=tickers)
+    sizes = size.reindex(index=dates, columns=tickers).to_numpy(dtype=np.float64)
+    n_days, n_names = prices.shape
+
+    portfolio_return = np.zeros(n_days)
+    turnover = np.zeros(n_days)
+    gross_exposure = np.zeros(n_days)
+    net_exposure = np.zeros(n_days)
+    weights_out = np.zeros((n_days, n_names)) if return_weights else None
+
+    last_side = np.zeros(n_names, dtype=np.int8)
+    last_weight = np.zeros(n_names)
+    # Weights going into the first date after drifting with that day's returns
+    drifted = np.zeros(n_names)
+    for start in range(0, n_days, chunk_days):
+        stop = min(start + chunk_days, n_days)
+        directions = _directions(directions_all.iloc[start:stop].to_numpy())
+        weights, last_side, last_weight = target_weights(
+            directions, np.nan_to_num(sizes[start:stop]), last_side, last_weight)
+        chunk_prices = prices[start:stop]
+        weights = np.clip(weights, -config.MAX_POSITION_SIZE, config.MAX_POSITION_SIZE)
+        weights[np.isnan(chunk_prices)] = 0.0
+        gross = np.abs(weights).sum(axis=1)
+        scale = np.where(gross > config.MAX_GROSS_EXPOSURE,
+                         config.MAX_GROSS_EXPOSURE / np.where(gross > 0, gross, 1.0), 1.0)
+        weights *= scale[:, None]
+
+        # Return of each name from this close to the next one
+        next_prices = prices[start + 1:stop + 1]
+        if len(next_prices) < len(chunk_prices):
+            next_prices = np.vstack([next_prices, np.full((1, n_names), np.nan)])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            next_return = np.nan_to_num(next_prices / chunk_prices - 1, nan=0.0, posinf=0.0,
+                                        neginf=0.0)
+        gross_return = (weights * next_return).sum(axis=1)
+
+        # Pre-trade weights are yesterday's weights after yesterday-to-today returns
+        pre_trade = np.vstack([drifted[None, :],
+                               weights[:-1] * (1 + next_return[:-1]) /
+                               (1 + gross_return[:-1])[:, None]])
+        drifted = weights[-1] * (1 + next_return[-1]) / (1 + gross_return[-1])
+        chunk_turnover = np.abs(weights - pre_trade).sum(axis=1)
+
+        portfolio_return[start:stop] = gross_return - cost_bps / 1e4 * chunk_turnover
+        turnover[start:stop] = chunk_turnover
+        gross_exposure[start:stop] = np.abs(weights).sum(axis=1)
+        net_exposure[start:stop] = weights.sum(axis=1)
+        if return_weights:
+            weights_out[start:stop] = weights
+
+    value = np.cumprod(1 + portfolio_return)
+    value_before = np.r_[1.0, value[:-1]]
+    results_df = pd.DataFrame({
+        'portfolio_return': portfolio_return,
+        'portfolio_value': value,
+        # Cash left after buying longs and receiving short proceeds at each close
+        'cash': value_before * (1 - net_exposure),
+        'gross_exposure': gross_exposure,
+        'net_exposure': net_exposure,
+        'turnover': turnover,
+    }, index=dates)
+    metrics = portfolio_metrics(results_df)
+    if return_weights:
+        return results_df, metrics, pd.DataFrame(weights_out, index=dates, columns=tickers)
+    return results_df, metrics
+
+
+def portfolio_metrics(results_df, periods_per_year=252):
+    returns = results_df['portfolio_return'].to_numpy()
+    value = results_df['portfolio_value'].to_numpy()
+    volatility = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    cum_returns = value - 1
+    peak = np.maximum.accumulate(cum_returns)
+    return {
+        'total_return': cum_returns[-1],
+        'volatility': volatility * np.sqrt(periods_per_year),
+        'sharpe': returns.mean() / volatility * np.sqrt(periods_per_year) if volatility > 0 else 0,
+        'max_drawdown': ((cum_returns - peak) / (1 + peak)).min(),
+        'avg_daily_turnover': results_df['turnover'].mean(),
+        'annual_turnover': results_df['turnover'].mean() * periods_per_year,
+        'avg_gross_exposure': results_df['gross_exposure'].mean(),
+        'avg_net_exposure': results_df['net_exposure'].mean(),
+        'win_rate': (returns > 0).mean(),
+    }
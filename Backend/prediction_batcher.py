@@ -0,0 +1,95 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class PredictionBatcher:
+    """Coalesces concurrent prediction requests into one model call.
+
+    Requests are queued; a single worker thread takes the first one, waits up
+    to ``max_wait`` seconds for up to ``max_batch`` more, then stacks the rows
+    for each predictor and runs ``predict_with_confidence`` once per predictor.
+    Under load this turns N per-request passes through every ensemble member
+    into one vectorized pass, and an idle server only pays ``max_wait``.
+    (Ridge's BLAS matrix product can round the last bit differently depending
+    on how many rows share a call.)
+    """
+
+    def __init__(self, max_batch=None, max_wait=None):
+        self.max_batch = max_batch or int(os.getenv("FINVEST_PREDICT_BATCH_SIZE", "64"))
+        self.max_wait = max_wait if max_wait is not None else \
+            float(os.getenv("FINVEST_PREDICT_BATCH_WAIT_MS", "5")) / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.counters = {"requests": 0, "batches": 0, "rows": 0, "largest_batch": 0}
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="predict-batcher",
+                                                daemon=True)
+                self._thread.start()
+
+    def submit(self, predictor, X):
+        """Queue rows ``X`` for ``predictor``; the future resolves to ``(pred, confidence)``"""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((predictor, np.asarray(X, dtype=np.float64), future))
+        return future
+
+    def predict(self, predictor, X):
+        return self.submit(predictor, X).result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        wait_until = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = wait_until - time.monotonic()
+            try:
+                # Past the deadline, still take whatever is already queued
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            groups = {}
+            for predictor, X, future in batch:
+                groups.setdefault(id(predictor), (predictor, []))[1].append((X, future))
+            for predictor, items in groups.values():
+                self._predict_group(predictor, items)
+            with self._lock:
+                self.counters["requests"] += len(batch)
+                self.counters["batches"] += len(groups)
+                self.counters["largest_batch"] = max(self.counters["largest_batch"], len(batch))
+
+    def _predict_group(self, predictor, items):
+        try:
+            X = np.vstack([X for X, _ in items])
+            pred, confidence = predictor.predict_with_confidence(X)
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+        with self._lock:
+            self.counters["rows"] += len(X)
+        start = 0
+        for rows, future in items:
+            end = start + len(rows)
+            future.set_result((pred[start:end], confidence[start:end]))
+            start = end
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats["avg_batch"] = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        stats.update(max_batch=self.max_batch, max_wait_ms=self.max_wait * 1000)
+        return stats
@@ -0,0 +1,344 @@
+import math
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+
+# Same default as ISC.Config.TREND_WINDOWS (importing ISC here would pull in sklearn/nltk)
+DEFAULT_TREND_WINDOWS = [5, 10]
+NAN = float("nan")
+
+
+def _div(a, b):
+    """IEEE division (inf/NaN on zero) like the vectorized batch code, not ZeroDivisionError"""
+    if b:
+        return a / b
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(a) / b)
+
+
+def _clean(val):
+    val = float(val)
+    # pandas treats infinities in rolling windows as missing
+    return NAN if math.isinf(val) else val
+
+
+class RollingMean:
+    """Fixed-window mean updated in O(1) per value.
+
+    Keeps a running sum of the window (NaN values are skipped and make the
+    window incomplete, like ``rolling(window).mean()``). The sum is rebuilt
+    from the buffer once per ``window`` updates so rounding errors from
+    adding and removing values never accumulate; results match pandas to
+    within floating-point rounding.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.updates = 0
+
+    def update(self, val):
+        val = _clean(val)
+        self.values.append(val)
+        if val == val:
+            self.nobs += 1
+            self.sum_x += val
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                self.sum_x -= old
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self.sum_x = math.fsum(v for v in self.values if v == v)
+        if self.nobs < self.window:
+            return NAN
+        return self.sum_x / self.nobs
+
+
+class RollingStd:
+    """Fixed-window sample standard deviation updated in O(1) per value.
+
+    Running sums of the values and their squares, both taken relative to a
+    shift (the window's mean at the last rebuild) so that the variance does
+    not cancel catastrophically. Sums and shift are rebuilt from the buffer
+    once per ``window`` updates, and a window of identical values is exactly
+    0. Matches ``rolling(window).std()`` to within floating-point rounding.
+    """
+
+    def __init__(self, window, ddof=1):
+        self.window = window
+        self.ddof = ddof
+        self.values = deque()
+        self.nobs = 0
+        self.shift = 0.0
+        self.sum_d = 0.0
+        self.sum_d2 = 0.0
+        self.updates = 0
+        self.prev_value = None
+        self.same_values = 0
+
+    def _rebuild(self):
+        present = [v for v in self.values if v == v]
+        self.shift = math.fsum(present) / len(present) if present else 0.0
+        self.sum_d = math.fsum(v - self.shift for v in present)
+        self.sum_d2 = math.fsum((v - self.shift) ** 2 for v in present)
+
+    def update(self, val):
+        val = _clean(val)
+        self.same_values = self.same_values + 1 if val == self.prev_value else 1
+        self.prev_value = val
+        self.values.append(val)
+        if val == val:
+            self.nobs += 1
+            d = val - self.shift
+            self.sum_d += d
+            self.sum_d2 += d * d
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                d = old - self.shift
+                self.sum_d -= d
+                self.sum_d2 -= d * d
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self._rebuild()
+        if self.nobs < self.window or self.nobs <= self.ddof:
+            return NAN
+        if self.same_values >= self.window:
+            return 0.0
+        variance = (self.sum_d2 - self.sum_d * self.sum_d / self.nobs) / (self.nobs - self.ddof)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class RollingSlope:
+    """Rolling OLS slope over the last ``window`` values (see ISC.rolling_slope), O(1) per value.
+
+    slope = sum((k - k_mean) * y_k) / sum((k - k_mean)^2) from running sums
+    of y_k and k * y_k over the window; dropping the oldest value moves every
+    other one down a position, which takes sum(y) off the k-weighted sum.
+    Like RollingStd, both sums are taken relative to a shift and rebuilt from
+    the buffer once per ``window`` updates. Windows that are incomplete or
+    hold a non-finite value give NaN.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.k_mean = (window - 1) / 2.0
+        self.sxx = math.fsum((k - self.k_mean) ** 2 for k in range(window))
+        self.missing = 0
+        self.shift = 0.0
+        self.sum_d = 0.0
+        self.sum_kd = 0.0
+        self.updates = 0
+
+    def _rebuild(self):
+        present = [v for v in self.values if v == v]
+        self.shift = math.fsum(present) / len(present) if present else 0.0
+        self.sum_d = math.fsum(v - self.shift for v in present)
+        self.sum_kd = math.fsum(k * (v - self.shift) for k, v in enumerate(self.values) if v == v)
+
+    def update(self, val):
+        val = float(val)
+        if not math.isfinite(val):
+            val = NAN
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.sum_d -= old - self.shift
+            else:
+                self.missing -= 1
+            self.sum_kd -= self.sum_d
+        if val == val:
+            d = val - self.shift
+            self.sum_kd += len(self.values) * d
+            self.sum_d += d
+        else:
+            self.missing += 1
+        self.values.append(val)
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self._rebuild()
+        if len(self.values) < self.window or self.missing or self.window < 2:
+            return NAN
+        return (self.sum_kd - self.k_mean * self.sum_d) / self.sxx
+
+
+class IndicatorState:
+    """Streaming counterpart of ISC.technical_indicator_columns for one ticker.
+
+    ``update`` takes one bar and returns that bar's indicator row, NaN while
+    windows are still filling. Fed a ticker's bars from the first one, each
+    row matches the batch computation to within floating-point rounding;
+    state is O(largest window).
+    """
+
+    MA_WINDOWS = [5, 10, 20, 50]
+    VOL_WINDOWS = [5, 10, 20]
+    RSI_PERIODS = [14, 21]
+    MOMENTUM_WINDOWS = [3, 5, 10, 20]
+
+    def __init__(self, trend_windows=None):
+        self.trend_windows = list(trend_windows or DEFAULT_TREND_WINDOWS)
+        self.ma = {w: RollingMean(w) for w in self.MA_WINDOWS}
+        self.vol = {w: RollingStd(w) for w in self.VOL_WINDOWS}
+        self.rsi_up = {p: RollingMean(p) for p in self.RSI_PERIODS}
+        self.rsi_down = {p: RollingMean(p) for p in self.RSI_PERIODS}
+        self.bb_std = RollingStd(20)
+        self.volume_ma = RollingMean(10)
+        self.trend = {w: RollingSlope(w) for w in self.trend_windows}
+        # Closes needed for momentum (close / close.shift(w))
+        self.closes = deque(maxlen=max(self.MOMENTUM_WINDOWS) + 1)
+        self.bars = 0
+
+    def update(self, open_, high, low, close, volume):
+        open_, high, low, close, volume = (float(v) for v in (open_, high, low, close, volume))
+        prev_close = self.closes[-1] if self.closes else NAN
+        self.closes.append(close)
+        self.bars += 1
+        row = {}
+        row['return'] = _div(close, prev_close) - 1
+        row['log_return'] = float(np.log(_div(close, prev_close)))
+
+        for window, state in self.ma.items():
+            row[f'ma_{window}'] = state.update(close)
+            row[f'price_to_ma_{window}'] = _div(close, row[f'ma_{window}']) - 1
+
+        for window, state in self.vol.items():
+            row[f'vol_{window}'] = state.update(row['log_return'])
+        row['vol_ratio'] = _div(row['vol_5'], row['vol_20'] + 1e-9)
+
+        # Same clip / sign handling as the batch version (a flat day counts as -0.0 down)
+        delta = close - prev_close
+        up = delta if delta >= 0 or delta != delta else 0.0
+        down = -1 * (delta if delta <= 0 or delta != delta else 0.0)
+        for period in self.RSI_PERIODS:
+            rs = _div(self.rsi_up[period].update(up), self.rsi_down[period].update(down) + 1e-9)
+            row[f'rsi_{period}'] = 100 - _div(100, 1 + rs)
+
+        for window in self.MOMENTUM_WINDOWS:
+            past = self.closes[-window - 1] if len(self.closes) > window else NAN
+            row[f'mom_{window}'] = _div(close, past) - 1
+
+        bb_mean = row['ma_20']
+        bb_std = self.bb_std.update(close)
+        row['bb_upper'] = bb_mean + 2 * bb_std
+        row['bb_lower'] = bb_mean - 2 * bb_std
+        row['bb_position'] = _div(close - bb_mean, 2 * bb_std)
+
+        row['volume_ma_10'] = self.volume_ma.update(volume)
+        row['volume_ratio'] = _div(volume, row['volume_ma_10'] + 1)
+
+        row['daily_range'] = _div(high - low, close)
+        row['gap'] = _div(open_ - prev_close, prev_close)
+
+        for window, state in self.trend.items():
+            row[f'trend_{window}'] = state.update(close)
+        return row
+
+    @property
+    def ready(self):
+        """True once every window is full, i.e. the batch function would keep the row"""
+        longest = max(self.MA_WINDOWS + [max(self.RSI_PERIODS) + 1, max(self.VOL_WINDOWS) + 1,
+                                        max(self.MOMENTUM_WINDOWS) + 1] + self.trend_windows)
+        return self.bars >= longest
+
+
+class StreamingIndicators:
+    """Per-ticker indicator states; append bars as they arrive instead of recomputing"""
+
+    def __init__(self, trend_windows=None):
+        self.trend_windows = trend_windows
+        self.states = {}
+
+    def update(self, ticker, open_, high, low, close, volume):
+        state = self.states.get(ticker)
+        if state is None:
+            state = self.states[ticker] = IndicatorState(self.trend_windows)
+        return state.update(open_, high, low, close, volume)
+
+    def update_frame(self, bars):
+        """Feed a long frame of new bars (date-ordered per ticker); returns their indicator rows"""
+        rows = [
+            self.update(bar.ticker, bar.open, bar.high, bar.low, bar.close, bar.volume)
+            for bar in bars.itertuples(index=False)
+        ]
+        return pd.DataFrame(rows, index=bars.index)
+
+
+class RollingMeanCache:
+    """Rolling means of per-key price series that grow a few bars at a time.
+
+    ``rolling_mean(key, dates, values)`` returns what
+    ``pd.Series(values).rolling(window).mean()`` would, but keeps each key's
+    series and RollingMean state between calls so only bars it has not seen
+    yet are fed. A request that starts later than the stored series reuses
+    it; one that starts earlier or revises a stored bar rebuilds the key.
+    Each key keeps about ``window - 1`` bars more than the longest request
+    it has served, and least recently used keys are dropped beyond
+    ``max_keys``, so memory stays bounded in a long-running process.
+    """
+
+    def __init__(self, window, max_keys=256):
+        self.window = window
+        self.max_keys = max_keys
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _new_series(self):
+        return {"positions": {}, "dates": [], "values": [], "means": [], "span": 0,
+                "state": RollingMean(self.window)}
+
+    def _trim(self, series):
+        # Trim once the series is twice the size it needs, so rebasing is amortized O(1) per bar
+        keep = series["span"] + self.window - 1
+        drop = len(series["values"]) - keep
+        if drop < keep:
+            return
+        for name in ("dates", "values", "means"):
+            del series[name][:drop]
+        series["positions"] = {date: i for i, date in enumerate(series["dates"])}
+
+    def _extend(self, series, dates, values):
+        for date, value in zip(dates, values):
+            series["positions"][date] = len(series["values"])
+            series["dates"].append(date)
+            series["values"].append(value)
+            series["means"].append(series["state"].update(value))
+
+    def rolling_mean(self, key, dates, values):
+        dates = list(dates)
+        values = [_clean(v) for v in values]
+        if not dates:
+            return np.array([])
+        with self._lock:
+            series = self._series.get(key)
+            start = series["positions"].get(dates[0]) if series is not None else None
+            if start is not None:
+                stored = series["values"][start:start + len(values)]
+                # NaN != NaN, so compare the stored bars with missing values aligned
+                same = series["dates"][start:start + len(stored)] == dates[:len(stored)] and \
+                    np.array_equal(stored, values[:len(stored)], equal_nan=True)
+                if not same:
+                    start = None
+            if start is None:
+                series, start = self._new_series(), 0
+                self._series[key] = series
+            self._extend(series, dates[len(series["values"]) - start:],
+                         values[len(series["values"]) - start:])
+            means = np.array(series["means"][start:start + len(dates)])
+            series["span"] = max(series["span"], len(dates))
+            self._trim(series)
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_keys:
+                self._series.popitem(last=False)
+        # Windows reaching back before the requested bars are incomplete
+        means[:self.window - 1] = np.nan
+        return means
@@ -0,0 +1,230 @@
+"""Previous (loop / apply based) implementations of the vectorized pipeline
+stages, kept as test oracles and as the baselines timed in benchmarks.py."""
+import numpy as np
+import pandas as pd
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from scipy import stats
+
+from ISC import (Config, EnhancedStrategy, backtest_metrics, compute_enhanced_technical_indicators,
+                 generate_simulated_sentiment_data)
+
+
+def random_prices(n_rows, seed=0, columns=None):
+    """Geometric random walk(s) starting at 100"""
+    rng = np.random.default_rng(seed)
+    if columns is None:
+        return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_rows))))
+    steps = rng.normal(0, 0.02, (n_rows, len(columns)))
+    return pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), columns=columns)
+
+
+def random_panel(n_tickers, n_days, seed=0):
+    """Long (date, ticker, OHLCV) frame of random-walk bars"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=n_days)
+    frames = []
+    for i in range(n_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        frames.append(pd.DataFrame({
+            'date': dates, 'ticker': f'T{i:04d}', 'open': close * (1 + rng.normal(0, 0.002, n_days)),
+            'high': close * 1.01, 'low': close * 0.99, 'close': close,
+            'volume': rng.lognormal(12, 0.5, n_days).astype(int)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def per_ticker_indicators(panel):
+    """One compute_enhanced_technical_indicators call per ticker, stacked like the panel pass"""
+    per_ticker = pd.concat([compute_enhanced_technical_indicators(group)
+                            for _, group in panel.groupby('ticker')])
+    return per_ticker.sort_values(['date', 'ticker'], kind='stable').reset_index(drop=True)
+
+
+def linregress_slope(close, window):
+    """Trend feature as originally computed: linregress on every window"""
+    return close.rolling(window).apply(lambda x: stats.linregress(range(len(x)), x)[0], raw=True)
+
+
+def simulated_feed(n_headlines, start='2000-01-01', ticker='AAPL'):
+    """Simulated headline feed of ``n_headlines`` rows (about 0.7 headlines per business day)"""
+    market_dates = pd.bdate_range(start, periods=max(1, int(n_headlines / 0.6)))
+    return generate_simulated_sentiment_data(ticker, market_dates).head(n_headlines)
+
+
+def score_texts_per_row(texts):
+    """Original per-row headline scoring with a fresh VADER analyzer"""
+    sid = SentimentIntensityAnalyzer()
+
+    def original_score(text):
+        if not isinstance(text, str) or text.strip() == "":
+            return {'sentiment': 0.0, 'confidence': 0.0, 'word_count': 0}
+        scores = sid.polarity_scores(text)
+        word_count = len(text.split())
+        financial_terms = ['earnings', 'revenue', 'profit', 'growth', 'margin', 'guidance', 'outlook']
+        financial_weight = sum(1 for term in financial_terms if term.lower() in text.lower())
+        confidence = min(abs(scores['compound']) + financial_weight * 0.1, 1.0)
+        return {'sentiment': scores['compound'], 'confidence': confidence, 'word_count': word_count}
+
+    return pd.DataFrame([original_score(text) for text in texts])
+
+
+def random_scored_headlines(n_tickers, n_days, seed=0):
+    """Scored headlines (about 1.5 per ticker and day) at random (date, ticker) pairs"""
+    rng = np.random.default_rng(seed)
+    n_rows = int(n_tickers * n_days * 1.5)
+    dates = pd.bdate_range('2010-01-01', periods=n_days).date
+    tickers = np.array([f'T{i:03d}' for i in range(n_tickers)])
+    return pd.DataFrame({
+        'date': dates[rng.integers(0, n_days, n_rows)],
+        'ticker': tickers[rng.integers(0, n_tickers, n_rows)],
+        'sentiment': rng.uniform(-1, 1, n_rows).round(4),
+        'confidence': rng.uniform(0, 1, n_rows)
+    })
+
+
+def aggregate_daily_sentiment_apply(scored):
+    """Original per-group groupby().apply() daily aggregation"""
+    def weighted_sentiment(group):
+        if len(group) == 0:
+            return pd.Series({'sentiment': 0.0, 'confidence': 0.0, 'news_count': 0})
+
+        weights = group['confidence'] + 0.1  # Avoid zero weights
+        weighted_sent = (group['sentiment'] * weights).sum() / weights.sum()
+        avg_confidence = group['confidence'].mean()
+        news_count = len(group)
+
+        return pd.Series({
+            'sentiment': weighted_sent,
+            'confidence': avg_confidence,
+            'news_count': news_count
+        })
+
+    daily = scored.groupby(['date', 'ticker']).apply(weighted_sentiment).reset_index()
+    daily['date'] = pd.to_datetime(daily['date'])
+
+    return daily
+
+
+def fitted_strategy(n_train, n_features, seed=0):
+    """EnhancedStrategy whose ensemble is fitted on random features; returns (strategy, rng)"""
+    rng = np.random.default_rng(seed)
+    X_train = rng.normal(size=(n_train, n_features))
+    y_train = X_train[:, 0] * 0.01 + rng.normal(scale=0.01, size=n_train)
+    strategy = EnhancedStrategy()
+    strategy.predictor.fit(X_train, y_train)
+    return strategy, rng
+
+
+def random_feature_rows(rng, n_rows, feature_cols):
+    df = pd.DataFrame(rng.normal(size=(n_rows, len(feature_cols))), columns=feature_cols)
+    df['sentiment'] = rng.uniform(-1, 1, n_rows)
+    df['confidence'] = rng.uniform(0, 1, n_rows)
+    return df
+
+
+def generate_signals_apply(strategy, features_df, feature_cols, split_idx):
+    """Original EnhancedStrategy.generate_signals: one signal_for call per row via apply()"""
+    test_df = features_df.iloc[split_idx:].copy()
+    X_test = test_df[feature_cols].values
+
+    pred_returns, confidence = strategy.predictor.predict_with_confidence(X_test)
+    test_df['pred_next_return'] = pred_returns
+    test_df['pred_confidence'] = confidence
+
+    def generate_signal(row):
+        return strategy.signal_for(row['pred_next_return'], row['pred_confidence'],
+                                   row['sentiment'], row.get('confidence', 0.5))
+
+    signals = test_df.apply(generate_signal, axis=1)
+    test_df['signal'] = [s[0] for s in signals]
+    test_df['final_score'] = [s[1] for s in signals]
+    test_df['position_size'] = [s[2] for s in signals]
+
+    return test_df
+
+
+def simulated_signals(n_bars, trade_prob=0.05, seed=0):
+    """Random-walk prices with BUY/SELL/HOLD signals, shaped like generate_signals output"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n_bars)))
+    draw = rng.uniform(size=n_bars)
+    signal = np.where(draw < trade_prob / 2, 'BUY', np.where(draw < trade_prob, 'SELL', 'HOLD'))
+    size = rng.uniform(0, Config.MAX_POSITION_SIZE, n_bars)
+    return pd.DataFrame({
+        'date': pd.bdate_range('1900-01-01', periods=n_bars),
+        'close': close,
+        'target_next_return': np.r_[close[1:] / close[:-1] - 1, 0.0],
+        'signal': signal.astype(object),
+        'position_size': np.where(signal == 'BUY', size, np.where(signal == 'SELL', -size, 0.0)),
+    })
+
+
+def enhanced_backtest_iterrows(signals_df, config=Config):
+    """Original row-by-row enhanced_backtest (iterrows), with the stop rules read from ``config``"""
+    df = signals_df.copy().reset_index(drop=True)
+
+    # Initialize tracking variables
+    position = 0
+    entry_price = None
+    portfolio_value = 1.0
+    cash = 1.0
+
+    results = []
+
+    for i, row in df.iterrows():
+        current_price = row['close']
+        next_return = row['target_next_return']
+        signal = row['signal']
+        position_size = row['position_size']
+
+        # Calculate current portfolio value
+        if position != 0 and entry_price is not None:
+            current_portfolio_value = cash + position * (current_price / entry_price - 1)
+        else:
+            current_portfolio_value = cash
+
+        # Risk management: stop loss and take profit
+        if position != 0 and entry_price is not None:
+            price_change = (current_price / entry_price - 1)
+
+            # Check stop loss or take profit
+            if (position > 0 and price_change < -config.STOP_LOSS_PCT) or \
+               (position < 0 and price_change > config.STOP_LOSS_PCT) or \
+               (position > 0 and price_change > config.TAKE_PROFIT_PCT) or \
+               (position < 0 and price_change < -config.TAKE_PROFIT_PCT):
+                # Close position
+                cash = current_portfolio_value
+                position = 0
+                entry_price = None
+                signal = 'CLOSE'
+
+        # Execute new signals
+        if signal == 'BUY' and position <= 0:
+            cash = current_portfolio_value
+            position = position_size
+            entry_price = current_price
+        elif signal == 'SELL' and position >= 0:
+            cash = current_portfolio_value
+            position = -abs(position_size)
+            entry_price = current_price
+        elif signal == 'HOLD' and position != 0:
+            # Keep current position
+            pass
+
+        # Calculate strategy return for this period
+        if position != 0:
+            strategy_return = position * next_return
+        else:
+            strategy_return = 0.0
+
+        results.append({
+            'date': row['date'],
+            'signal': signal,
+            'position': position,
+            'strategy_return': strategy_return,
+            'market_return': next_return,
+            'portfolio_value': current_portfolio_value
+        })
+
+    results_df = pd.DataFrame(results)
+    return results_df, backtest_metrics(results_df)
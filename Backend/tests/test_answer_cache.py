@@ -0,0 +1,48 @@
+import numpy as np
+
+from answer_cache import AnswerCache, question_entities
+
+
+def first_word_embedding(question):
+    """Questions starting with the same word embed identically"""
+    seed = sum(map(ord, question.split()[0].lower()))
+    return np.random.default_rng(seed).normal(size=8)
+
+
+def test_embedding_failure_is_a_miss():
+    def failing(question):
+        raise RuntimeError("quota exceeded")
+
+    cache = AnswerCache(embed_fn=failing, ttl=0)
+    assert cache.get("s", "f", "What is the revenue?") == (None, None)
+    cache.put("s", "f", "What is the revenue?", "42", [])
+    entry, _ = cache.get("s", "f", "what is the revenue")
+    assert entry["answer"] == "42"
+    assert cache.stats()["errors"] == 2
+
+
+def test_semantic_match_stays_within_entities():
+    cache = AnswerCache(embed_fn=first_word_embedding, ttl=0)
+    cache.put("s", "f", "What was revenue in 2023?", "2023 answer", [])
+    entry, _ = cache.get("s", "f", "What did revenue look like in 2023")
+    assert entry["answer"] == "2023 answer"
+    assert cache.get("s", "f", "What was revenue in 2022?")[0] is None
+    assert cache.get("other", "f", "What was revenue in 2023?")[0] is None
+
+
+def test_question_entities():
+    assert question_entities("Did AAPL beat Q3 2023 EPS by 5%? I think") == \
+        ("2023", "5%", "AAPL", "EPS", "Q3")
+
+
+def test_eviction_and_expiry_drop_matrix_rows():
+    cache = AnswerCache(embed_fn=first_word_embedding, ttl=0, max_entries=2)
+    for word in ["alpha", "beta", "gamma"]:
+        cache.put("s", "f", f"{word} question", word, [])
+    assert cache.get("s", "f", "alpha again")[0] is None
+    assert cache.get("s", "f", "gamma again")[0]["answer"] == "gamma"
+    assert sum(len(rows["questions"]) for rows in cache._scopes.values()) == 2
+
+    cache.ttl = 1e-9
+    assert cache.get("s", "f", "gamma again")[0] is None
+    assert [rows["questions"] for rows in cache._scopes.values()] == [["beta question"]]
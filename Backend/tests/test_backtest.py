@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ISC import RunConfig, enhanced_backtest
+from tests.reference import enhanced_backtest_iterrows, simulated_signals
+
+
+@pytest.mark.parametrize("trade_prob", [0.0, 0.01, 0.05, 0.3, 1.0])
+def test_engine_matches_iterrows_loop(trade_prob):
+    signals = simulated_signals(3000, trade_prob, seed=1)
+    result, metrics = enhanced_backtest(signals)
+    reference, reference_metrics = enhanced_backtest_iterrows(signals)
+    pd.testing.assert_frame_equal(result, reference, check_exact=True)
+    assert metrics == reference_metrics
+
+
+@pytest.mark.parametrize("overrides", [
+    {'STOP_LOSS_PCT': 0.005, 'TAKE_PROFIT_PCT': 0.01},  # stops hit almost every trade
+    {'STOP_LOSS_PCT': np.inf, 'TAKE_PROFIT_PCT': np.inf},  # stops never hit
+])
+def test_engine_matches_iterrows_loop_with_other_stops(overrides):
+    config = RunConfig(**overrides)
+    signals = simulated_signals(3000, 0.05, seed=2)
+    result, metrics = enhanced_backtest(signals, config)
+    reference, reference_metrics = enhanced_backtest_iterrows(signals, config)
+    pd.testing.assert_frame_equal(result, reference, check_exact=True)
+    assert metrics == reference_metrics
+
+
+def test_engine_ignores_index_and_repeated_signals():
+    signals = simulated_signals(500, 0.3, seed=3)
+    signals.index = signals.index * 3 + 7
+    # Runs of the same signal must not re-enter an open position
+    signals.loc[signals.index[100:140], 'signal'] = 'BUY'
+    result, _ = enhanced_backtest(signals)
+    reference, _ = enhanced_backtest_iterrows(signals)
+    pd.testing.assert_frame_equal(result, reference, check_exact=True)
@@ -0,0 +1,99 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import ISC
+import data_store
+
+
+def write_market_csv(path, n_days=300, tickers=('AAPL', 'MSFT')):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2021-06-01', periods=n_days)
+    market = pd.DataFrame({
+        'date': np.tile(dates, len(tickers)),
+        'ticker': np.repeat(list(tickers), n_days),
+        'close': rng.uniform(50, 150, n_days * len(tickers)),
+        'volume': rng.integers(1000, 5000, n_days * len(tickers)),
+    })
+    market.to_csv(path, index=False)
+    return market
+
+
+def test_load_ticker_matches_csv(tmp_path):
+    csv_path = tmp_path / 'market.csv'
+    market = write_market_csv(csv_path)
+    data_store.convert_csv(csv_path, tmp_path, 'market')
+    loaded = data_store.load_ticker(tmp_path, 'market', 'MSFT', start='2021-09-01')
+    expected = pd.read_csv(csv_path, parse_dates=['date'])
+    expected = expected[(expected['ticker'] == 'MSFT') & (expected['date'] >= '2021-09-01')]
+    pd.testing.assert_frame_equal(loaded, expected.reset_index(drop=True), check_dtype=False)
+    assert len(loaded) < len(market) / 2
+
+
+def test_unknown_ticker_gives_typed_empty_frame(tmp_path):
+    csv_path = tmp_path / 'market.csv'
+    write_market_csv(csv_path)
+    data_store.convert_csv(csv_path, tmp_path, 'market')
+    known = data_store.load_ticker(tmp_path, 'market', 'AAPL')
+    unknown = data_store.load_ticker(tmp_path, 'market', 'NOPE')
+    assert unknown.empty
+    pd.testing.assert_series_equal(unknown.dtypes, known.dtypes)
+
+
+def test_is_current_tracks_csv_changes(tmp_path):
+    csv_path = tmp_path / 'market.csv'
+    write_market_csv(csv_path)
+    data_store.convert_csv(csv_path, tmp_path, 'market')
+    assert data_store.is_current(tmp_path, 'market', csv_path)
+
+    # Same size, newer mtime
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert not data_store.is_current(tmp_path, 'market', csv_path)
+
+    data_store.convert_csv(csv_path, tmp_path, 'market')
+    assert data_store.is_current(tmp_path, 'market', csv_path)
+    write_market_csv(csv_path, n_days=310)
+    assert not data_store.is_current(tmp_path, 'market', csv_path)
+
+    # Without the CSV the dataset is the only copy
+    os.remove(csv_path)
+    assert data_store.is_current(tmp_path, 'market', csv_path)
+
+
+def test_store_without_source_stamp_is_not_current(tmp_path):
+    csv_path = tmp_path / 'market.csv'
+    write_market_csv(csv_path)
+    data_store.convert_csv(csv_path, tmp_path, 'market')
+    # Layout written before the CSV stamp was recorded: just the column list
+    columns_file = tmp_path / 'market' / data_store.COLUMNS_FILE
+    columns_file.write_text(json.dumps(['date', 'ticker', 'close', 'volume']))
+    assert not data_store.is_current(tmp_path, 'market', csv_path)
+    assert len(data_store.load_ticker(tmp_path, 'market', 'AAPL')) == 300
+
+
+def test_load_or_generate_data_falls_back_to_changed_csv(tmp_path, monkeypatch):
+    paths = {name: tmp_path / f'{name}.csv' for name in ('market', 'sentiment', 'earnings')}
+    write_market_csv(paths['market'])
+    pd.DataFrame({'date': ['2021-06-01'], 'ticker': ['AAPL'], 'text': ['up'],
+                  'source': ['news']}).to_csv(paths['sentiment'], index=False)
+    pd.DataFrame({'date': ['2021-07-01'], 'ticker': ['AAPL'], 'eps_actual': [1.0],
+                  'eps_estimate': [0.9]}).to_csv(paths['earnings'], index=False)
+    store_dir = tmp_path / 'store'
+    data_store.convert_all(store_dir, paths)
+    monkeypatch.setattr(ISC.Config, 'DATA_STORE_DIR', str(store_dir))
+    monkeypatch.setattr(ISC.Config, 'MARKET_CSV', str(paths['market']))
+    monkeypatch.setattr(ISC.Config, 'SENTIMENT_CSV', str(paths['sentiment']))
+    monkeypatch.setattr(ISC.Config, 'EARNINGS_CSV', str(paths['earnings']))
+
+    market, _, _ = ISC.load_or_generate_data('AAPL')
+    assert len(market) == 300
+
+    write_market_csv(paths['market'], n_days=320)
+    market, _, _ = ISC.load_or_generate_data('AAPL')
+    assert len(market) == 320
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ISC import Config, compute_panel_technical_indicators, rolling_slope
+from tests.reference import linregress_slope, per_ticker_indicators, random_panel, random_prices
+
+
+@pytest.mark.parametrize("window", Config.TREND_WINDOWS)
+def test_rolling_slope_matches_linregress(window):
+    close = random_prices(2000)
+    assert np.allclose(rolling_slope(close, window), linregress_slope(close, window),
+                       rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_rolling_slope_per_column_and_nan_windows():
+    close = random_prices(300, columns=["A", "B", "C"])
+    close.iloc[100, 1] = np.nan
+    slope = rolling_slope(close, 20)
+    for column in close:
+        assert np.allclose(slope[column], linregress_slope(close[column], 20),
+                           rtol=1e-9, atol=1e-9, equal_nan=True)
+    assert slope["B"].iloc[100:120].isna().all()
+    assert slope["B"].iloc[120:].notna().all()
+
+
+def test_panel_indicators_match_per_ticker():
+    panel = random_panel(6, 300)
+    # Different calendars and lengths per ticker
+    panel = panel.drop(panel.index[(panel['ticker'] == 'T0001') & (panel.index % 7 == 0)])
+    panel = panel[(panel['ticker'] != 'T0002') | (panel['date'] >= '2020-06-01')]
+    stacked = compute_panel_technical_indicators(panel.sample(frac=1, random_state=0))
+    expected = per_ticker_indicators(panel)
+    pd.testing.assert_frame_equal(stacked, expected[stacked.columns], check_dtype=False)
+
+
+def test_panel_indicators_from_wide_frames():
+    panel = random_panel(3, 200)
+    fields = {field: panel.pivot(index='date', columns='ticker', values=field)
+              for field in ['open', 'high', 'low', 'close', 'volume']}
+    from_wide = compute_panel_technical_indicators(fields)
+    from_long = compute_panel_technical_indicators(panel)
+    pd.testing.assert_frame_equal(from_wide, from_long[from_wide.columns], check_dtype=False)
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from model_store import ModelStore
+
+
+@pytest.mark.parametrize("name", ["../evil", "..", "a/b", "/etc/passwd", "AAPL\n", "", ".hidden", None])
+def test_rejects_names_outside_the_store(tmp_path, name):
+    store = ModelStore(str(tmp_path / "models"))
+    with pytest.raises(ValueError):
+        store.get(name)
+
+
+def test_rejects_symlink_escaping_the_store(tmp_path):
+    root = tmp_path / "models"
+    store = ModelStore(str(root))
+    os.symlink(tmp_path, root / "LINK")
+    with pytest.raises(ValueError):
+        store.load("LINK")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = ModelStore(str(tmp_path / "models"))
+    assert store.get("BRK.B") == (None, None)
+    assert store.save("BRK.B", {"weights": [1, 2]}, "fp1", ["a", "b"]) == 1
+    assert store.save("BRK.B", {"weights": [1, 2]}, "fp1", ["a", "b"]) == 1
+    predictor, meta = store.get("BRK.B")
+    assert predictor == {"weights": [1, 2]}
+    assert meta["feature_cols"] == ["a", "b"]
+
+
+def test_get_reloads_when_another_process_saves(tmp_path):
+    serving = ModelStore(str(tmp_path / "models"))
+    training = ModelStore(str(tmp_path / "models"))
+    training.save("AAPL", {"weights": [1]}, "fp1", ["a"])
+    assert serving.get("AAPL")[0] == {"weights": [1]}
+    assert serving.get("AAPL")[1]["version"] == 1
+    assert serving.counters["loads"] == 1
+
+    training.save("AAPL", {"weights": [2]}, "fp2", ["a"])
+    predictor, meta = serving.get("AAPL")
+    assert predictor == {"weights": [2]}
+    assert meta["version"] == 2
+    assert serving.get("AAPL")[0] == {"weights": [2]}
+    assert serving.counters["loads"] == 2
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ISC import RunConfig, enhanced_backtest
+from portfolio_backtest import portfolio_backtest, signal_matrices
+from tests.reference import simulated_signals
+
+NO_STOPS = RunConfig(STOP_LOSS_PCT=np.inf, TAKE_PROFIT_PCT=np.inf)
+
+
+def as_matrix(signals, col, ticker='X'):
+    return signals.set_index('date')[[col]].rename(columns={col: ticker})
+
+
+@pytest.mark.parametrize("chunk_days", [700, 5000])
+def test_single_name_matches_enhanced_backtest(chunk_days):
+    signals = simulated_signals(3000, 0.05, seed=4)
+    reference, _ = enhanced_backtest(signals, NO_STOPS)
+    results, _ = portfolio_backtest(as_matrix(signals, 'close'), as_matrix(signals, 'signal'),
+                                    as_matrix(signals, 'position_size'), NO_STOPS,
+                                    chunk_days=chunk_days)
+    assert np.array_equal(results['portfolio_return'].to_numpy(),
+                          reference['strategy_return'].to_numpy())
+
+
+@pytest.mark.parametrize("chunk_days", [2, 5000])
+def test_zero_size_signal_leaves_book_flat(chunk_days):
+    # BUY at 0 size, then a sized BUY (re-enters); a zero-size SELL against a
+    # long closes it, a zero-size BUY while long is ignored
+    signal = ['HOLD', 'BUY', 'HOLD', 'BUY', 'HOLD', 'BUY', 'HOLD', 'SELL', 'HOLD', 'BUY',
+              'HOLD', 'SELL', 'SELL', 'HOLD']
+    size = [0.0, 0.0, 0.0, 0.1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.08, 0.0, 0.0, 0.05, 0.0]
+    close = 100 * np.cumprod(1 + np.r_[0, np.random.default_rng(0).normal(0, 0.01, 13)])
+    signals = pd.DataFrame({'date': pd.bdate_range('2024-01-01', periods=14), 'close': close,
+                            'signal': signal, 'position_size': size})
+    signals['target_next_return'] = signals['close'].shift(-1) / signals['close'] - 1
+    reference, _ = enhanced_backtest(signals, NO_STOPS)
+    results, _, weights = portfolio_backtest(
+        as_matrix(signals, 'close'), as_matrix(signals, 'signal'),
+        as_matrix(signals, 'position_size'), NO_STOPS, chunk_days=chunk_days, return_weights=True)
+    assert np.array_equal(weights['X'].to_numpy(), reference['position'].to_numpy())
+    assert weights['X'].iloc[3] == 0.1
+    assert np.allclose(results['portfolio_return'].to_numpy(),
+                       reference['strategy_return'].fillna(0).to_numpy(), rtol=0, atol=1e-15)
+
+
+def test_chunking_does_not_change_results():
+    frames = []
+    for i in range(4):
+        signals = simulated_signals(1500, 0.1, seed=i)
+        frames.append(signals.assign(ticker=f'T{i}'))
+    close, signal, size = signal_matrices(pd.concat(frames))
+    # A name that starts trading late
+    close.iloc[:300, 3] = np.nan
+    config = RunConfig(MAX_GROSS_EXPOSURE=0.15)
+    whole, metrics, weights = portfolio_backtest(close, signal, size, config, cost_bps=5,
+                                                 chunk_days=10 ** 6, return_weights=True)
+    chunked, chunked_metrics, chunked_weights = portfolio_backtest(
+        close, signal, size, config, cost_bps=5, chunk_days=97, return_weights=True)
+    pd.testing.assert_frame_equal(chunked, whole)
+    pd.testing.assert_frame_equal(chunked_weights, weights)
+    assert (weights.iloc[:300, 3] == 0).all()
+    assert (weights.abs().sum(axis=1) <= 0.15 + 1e-12).all()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from ISC import (aggregate_daily_sentiment, compute_enhanced_sentiment, score_text, score_texts,
+                 shard_by_group)
+from tests.reference import (aggregate_daily_sentiment_apply, random_scored_headlines,
+                             score_texts_per_row, simulated_feed)
+
+
+def test_score_texts_matches_per_row_scoring():
+    texts = pd.concat([simulated_feed(3000)['text'], pd.Series([
+        None, np.nan, "", "   ", "Earnings and revenue growth beat the outlook",
+        "EARNINGS miss; guidance, margin and profit-growth cut",
+    ])], ignore_index=True)
+    score_text.cache_clear()
+    sentiment, confidence, word_count = score_texts(texts)
+    reference = score_texts_per_row(texts)
+    assert np.array_equal(sentiment, reference['sentiment'])
+    assert np.array_equal(confidence, reference['confidence'])
+    assert np.array_equal(word_count, reference['word_count'])
+
+
+def test_daily_aggregation_matches_apply():
+    scored = random_scored_headlines(20, 200)
+    # Groups larger than 8 headlines take the np.sum path
+    scored = pd.concat([scored, scored[scored['ticker'] == 'T000'].head(40).assign(ticker='BIG')])
+    pd.testing.assert_frame_equal(aggregate_daily_sentiment(scored),
+                                  aggregate_daily_sentiment_apply(scored), check_exact=True)
+
+
+def test_daily_aggregation_drops_rows_without_date_or_ticker():
+    scored = random_scored_headlines(5, 50)
+    scored.loc[scored.index[::7], 'ticker'] = None
+    scored.loc[scored.index[3::11], 'date'] = None
+    pd.testing.assert_frame_equal(aggregate_daily_sentiment(scored),
+                                  aggregate_daily_sentiment_apply(scored), check_exact=True)
+
+
+def test_compute_enhanced_sentiment_skips_missing_ticker():
+    day = pd.Timestamp('2024-01-02')
+    feed = pd.DataFrame({'date': [day, day, day], 'ticker': ['A', None, 'A'],
+                         'text': ['profit growth strong', 'loss decline', 'weak outlook']})
+    daily = compute_enhanced_sentiment(feed)
+    assert list(daily['ticker']) == ['A']
+    assert daily['news_count'].tolist() == [2.0]
+    assert compute_enhanced_sentiment(feed.iloc[[1]]).empty
+
+
+def test_shards_never_split_a_group_and_skip_missing_keys():
+    feed = random_scored_headlines(5, 100)
+    feed.loc[feed.index[::9], 'ticker'] = None
+    feed.loc[feed.index[4::13], 'date'] = None
+    shards = shard_by_group(feed, 50)
+    assert len(shards) > 1
+    keys = [set(zip(shard['date'], shard['ticker'])) for shard in shards]
+    assert all(not a & b for i, a in enumerate(keys) for b in keys[i + 1:])
+    kept = pd.concat(shards).sort_index()
+    pd.testing.assert_frame_equal(kept, feed.dropna(subset=['date', 'ticker']))
+    assert shard_by_group(feed[feed['ticker'].isna()], 50) == []
+
+
+def test_parallel_sentiment_matches_serial_with_missing_keys():
+    feed = simulated_feed(600)
+    feed['text'] = feed['text'] + ' ' + feed.index.astype(str)
+    feed.loc[feed.index[::17], 'ticker'] = None
+    feed.loc[feed.index[5::23], 'date'] = None
+    serial = compute_enhanced_sentiment(feed, workers=1)
+    parallel = compute_enhanced_sentiment(feed, workers=2, chunk_size=100)
+    pd.testing.assert_frame_equal(parallel, serial, check_exact=True)
+    assert compute_enhanced_sentiment(feed[feed['ticker'].isna()], workers=2, chunk_size=10).empty
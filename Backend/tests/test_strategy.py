@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from ISC import Config, EnhancedStrategy
+from tests.reference import fitted_strategy, generate_signals_apply, random_feature_rows
+
+
+def test_generate_signals_matches_row_wise_apply():
+    strategy, rng = fitted_strategy(400, 6)
+    feature_cols = [f'f{i}' for i in range(6)]
+    df = random_feature_rows(rng, 2000, feature_cols)
+    vectorized = strategy.generate_signals(df, feature_cols, 500)
+    reference = generate_signals_apply(strategy, df, feature_cols, 500)
+    pd.testing.assert_frame_equal(vectorized, reference, check_exact=True)
+
+
+def test_signal_arrays_match_signal_for_on_edge_cases():
+    strategy = EnhancedStrategy()
+    buy, sell = Config.PRED_RETURN_BUY_THRESHOLD, Config.PRED_RETURN_SELL_THRESHOLD
+    cases = [
+        # pred_ret, conf, sentiment, sent_conf
+        (buy, 1.0, 0.0, 0.5),
+        (buy * 1.01, 1.0, 0.0, 0.5),
+        (sell, 1.0, 0.0, 0.5),
+        (sell * 1.01, 1.0, 0.0, 0.5),
+        (0.05, Config.CONFIDENCE_THRESHOLD, 0.0, 0.5),
+        (0.05, Config.CONFIDENCE_THRESHOLD * 0.99, 0.0, 0.5),
+        (0.05, np.nan, 0.0, 0.5),
+        (np.nan, 0.9, 0.3, 0.5),
+        (0.0, 0.9, 1.0, 1.0),
+        (0.0, 0.9, -1.0, 1.0),
+        (0.01, 3.0, 0.0, 0.5),
+    ]
+    signal, final_score, position_size = strategy.signal_arrays(*zip(*cases))
+    for i, case in enumerate(cases):
+        expected = strategy.signal_for(*case)
+        assert signal[i] == expected[0]
+        np.testing.assert_array_equal([final_score[i], position_size[i]], expected[1:])
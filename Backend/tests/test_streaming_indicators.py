@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from ISC import rolling_slope, technical_indicator_columns
+from streaming_indicators import (IndicatorState, RollingMeanCache, RollingSlope, RollingStd,
+                                  StreamingIndicators)
+from tests.reference import random_panel
+
+
+def batch_indicators(bars):
+    bars = bars.reset_index(drop=True)
+    return pd.DataFrame(technical_indicator_columns(
+        bars['open'], bars['high'], bars['low'], bars['close'], bars['volume'])).astype(np.float64)
+
+
+def streamed_indicators(bars):
+    state = IndicatorState()
+    rows = [state.update(bar.open, bar.high, bar.low, bar.close, bar.volume)
+            for bar in bars.itertuples(index=False)]
+    return pd.DataFrame(rows)
+
+
+def test_indicator_state_matches_batch():
+    bars = random_panel(1, 1500)
+    # A flat stretch (zero variance / zero RSI moves) and a missing bar
+    bars.loc[600:640, ['open', 'high', 'low', 'close']] = 123.25
+    bars.loc[900, 'close'] = np.nan
+    batch = batch_indicators(bars)
+    streamed = streamed_indicators(bars)[batch.columns]
+    pd.testing.assert_frame_equal(streamed, batch, check_exact=False, rtol=1e-9, atol=1e-10)
+
+
+def test_streaming_indicators_per_ticker():
+    panel = random_panel(3, 200)
+    streaming = StreamingIndicators()
+    rows = streaming.update_frame(panel.sort_values(['date', 'ticker']))
+    for ticker, bars in panel.groupby('ticker'):
+        batch = batch_indicators(bars)
+        streamed = rows.loc[bars.index, batch.columns].reset_index(drop=True)
+        pd.testing.assert_frame_equal(streamed, batch, check_exact=False, rtol=1e-9, atol=1e-10)
+
+
+def test_rolling_std_stays_accurate_over_long_runs():
+    values = 1e6 + np.random.default_rng(0).normal(0, 1e-3, 20000)
+    state = RollingStd(20)
+    streamed = np.array([state.update(v) for v in values])
+    expected = pd.Series(values).rolling(20).std().to_numpy()
+    assert np.allclose(streamed, expected, rtol=1e-6, equal_nan=True)
+
+
+def test_rolling_slope_stays_accurate_over_long_runs():
+    values = 1e4 + np.cumsum(np.random.default_rng(0).normal(0, 1, 20000))
+    values[5000] = np.nan
+    values[12000] = np.inf
+    for window in (2, 5, 20):
+        state = RollingSlope(window)
+        streamed = np.array([state.update(v) for v in values])
+        expected = rolling_slope(np.where(np.isinf(values), np.nan, values), window)
+        np.testing.assert_allclose(streamed, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_rolling_mean_cache_matches_series_rolling():
+    bars = random_panel(1, 300)
+    dates, close = list(bars['date']), bars['close'].to_numpy()
+    cache = RollingMeanCache(20)
+
+    def check(start, end, values=close):
+        expected = pd.Series(values[start:end]).rolling(20).mean().to_numpy()
+        result = cache.rolling_mean('T', dates[start:end], values[start:end])
+        assert np.allclose(result, expected, rtol=1e-12, atol=0, equal_nan=True)
+
+    check(100, 220)
+    check(100, 221)  # one new bar
+    check(150, 280)  # window moved forward
+    check(0, 120)    # starts before the stored series
+    revised = close.copy()
+    revised[110] *= 1.01
+    check(0, 130, revised)  # a stored bar was revised
+    check(0, 5)
+    assert cache.rolling_mean('T', [], []).size == 0
+
+
+def test_rolling_mean_cache_keeps_series_bounded():
+    bars = random_panel(1, 3000)
+    dates, close = list(bars['date']), bars['close'].to_numpy()
+    cache = RollingMeanCache(20)
+    for end in range(180, 3000, 7):
+        result = cache.rolling_mean('T', dates[end - 180:end], close[end - 180:end])
+        expected = pd.Series(close[end - 180:end]).rolling(20).mean().to_numpy()
+        assert np.allclose(result, expected, rtol=1e-12, atol=0, equal_nan=True)
+        series = cache._series['T']
+        assert len(series['values']) <= 2 * (180 + 19)
+        assert len(series['positions']) == len(series['dates'])
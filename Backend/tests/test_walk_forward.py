@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import RobustScaler
+
+import walk_forward as wf
+from ISC import EnhancedPredictor, RunConfig, enhanced_backtest
+from walk_forward import grow_warm_start, rolling_robust_scalers, walk_forward, walk_forward_windows
+
+
+def random_features(n_rows, n_features=4, seed=0):
+    rng = np.random.default_rng(seed)
+    feature_cols = [f'f{i}' for i in range(n_features)]
+    df = pd.DataFrame(rng.normal(size=(n_rows, n_features)), columns=feature_cols)
+    df.insert(0, 'date', pd.bdate_range('2020-01-01', periods=n_rows))
+    df['sentiment'] = rng.uniform(-1, 1, n_rows)
+    df['confidence'] = rng.uniform(0, 1, n_rows)
+    df['target_next_return'] = 0.01 * df['f0'] + rng.normal(0, 0.01, n_rows)
+    df['close'] = 100 * np.exp(np.cumsum(df['target_next_return'].shift(fill_value=0)))
+    return df, feature_cols
+
+
+@pytest.mark.parametrize('train_window', [0, 50])
+def test_rolling_robust_scalers_match_fit_per_window(train_window):
+    rng = np.random.default_rng(1)
+    X = rng.standard_t(3, size=(300, 3))
+    X[:, 2] = 7.0  # Zero spread: RobustScaler uses a scale of 1
+    windows = walk_forward_windows(len(X), train_window, min_train=60, retrain_every=35)
+    scalers = rolling_robust_scalers(X, windows, train_window)
+    assert len(scalers) == len(windows)
+    for (train_start, train_end, _), scaler in zip(windows, scalers):
+        expected = RobustScaler().fit(X[train_start:train_end])
+        np.testing.assert_allclose(scaler.center_, expected.center_, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(scaler.scale_, expected.scale_, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('warm_start', [False, True])
+def test_predictions_only_use_rows_before_train_end(warm_start):
+    df, feature_cols = random_features(240)
+    kwargs = dict(train_window=100, min_train=100, retrain_every=50, warm_start=warm_start,
+                  n_jobs=1, config=RunConfig(WF_WARM_START_TREES=10, WF_WARM_START_MAX_TREES=320))
+    windows = walk_forward_windows(len(df), 100, 100, 50)
+    signals, _ = walk_forward(df, feature_cols, **kwargs)
+
+    # Scramble every label and feature from the second window's train_end on:
+    # nothing scored up to the end of that window may change
+    _, train_end, test_end = windows[1]
+    leaked = df.copy()
+    rng = np.random.default_rng(2)
+    leaked.loc[train_end:, 'target_next_return'] = rng.normal(0, 1, len(df) - train_end)
+    leaked.loc[test_end:, feature_cols] = rng.normal(0, 5, (len(df) - test_end, len(feature_cols)))
+    leaked_signals, _ = walk_forward(leaked, feature_cols, **kwargs)
+
+    scored = test_end - windows[0][1]
+    outputs = ['pred_next_return', 'pred_confidence', 'signal', 'final_score', 'position_size']
+    pd.testing.assert_frame_equal(signals[outputs].iloc[:scored],
+                                  leaked_signals[outputs].iloc[:scored], check_exact=True)
+    # The scrambled rows do reach the later windows
+    assert not np.allclose(signals['pred_next_return'].iloc[scored:],
+                           leaked_signals['pred_next_return'].iloc[scored:])
+
+
+def test_warm_start_tree_count_is_capped():
+    df, feature_cols = random_features(200)
+    X = df[feature_cols].to_numpy()
+    y = df['target_next_return'].to_numpy()
+    predictor = EnhancedPredictor(rf_n_jobs=1)
+    predictor.fit(X[:100], y[:100])
+    max_trees = 400
+    for train_end in range(110, 200, 10):
+        grow_warm_start(predictor, 50, max_trees)
+        predictor.fit(X[:train_end], y[:train_end], scaler=predictor.scaler)
+        assert len(predictor.models['rf'].estimators_) <= max_trees
+        assert len(predictor.models['gb'].estimators_) <= max_trees
+    # The forest keeps its newest trees once it is full
+    assert len(predictor.models['rf'].estimators_) == max_trees
+
+
+def test_main_walk_forward_uses_config_for_windows_and_backtest(monkeypatch):
+    df, feature_cols = random_features(200)
+    monkeypatch.setattr(wf, 'load_or_generate_data', lambda ticker: (None, None, None))
+    monkeypatch.setattr(wf, 'prepare_enhanced_features', lambda *frames: df)
+    monkeypatch.setattr(wf, 'select_feature_cols', lambda features_df: feature_cols)
+    config = RunConfig(WF_TRAIN_WINDOW=0, WF_MIN_TRAIN=120, WF_RETRAIN_EVERY=40, CV_N_JOBS=1,
+                       PRED_RETURN_BUY_THRESHOLD=0.0, PRED_RETURN_SELL_THRESHOLD=0.0,
+                       CONFIDENCE_THRESHOLD=0.0, STOP_LOSS_PCT=0.002, TAKE_PROFIT_PCT=0.003)
+
+    signals, report, backtest_df, metrics = wf.main_walk_forward(config=config)
+
+    assert report['train_rows'].tolist() == [120, 160]
+    assert report['test_rows'].tolist() == [40, 40]
+    expected_df, expected_metrics = enhanced_backtest(signals, config)
+    pd.testing.assert_frame_equal(backtest_df, expected_df)
+    assert metrics == expected_metrics
+    # The tight stops matter, so the default config would have given a different backtest
+    assert not enhanced_backtest(signals)[0]['signal'].equals(backtest_df['signal'])
@@ -0,0 +1,202 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.preprocessing import RobustScaler
+
+from ISC import (Config, EnhancedPredictor, EnhancedStrategy, enhanced_backtest,
+                 load_or_generate_data, prepare_enhanced_features, select_feature_cols)
+
+
+def walk_forward_windows(n_rows, train_window=None, min_train=None, retrain_every=None,
+                         config=Config):
+    """``(train_start, train_end, test_end)`` row bounds; each model scores ``train_end:test_end``.
+
+    Unset arguments come from ``config``; a ``train_window`` of 0 trains on
+    all earlier rows.
+    """
+    train_window = config.WF_TRAIN_WINDOW if train_window is None else train_window
+    min_train = min_train or config.WF_MIN_TRAIN
+    retrain_every = retrain_every or config.WF_RETRAIN_EVERY
+    windows = []
+    for train_end in range(min_train, n_rows, retrain_every):
+        train_start = max(0, train_end - train_window) if train_window else 0
+        windows.append((train_start, train_end, min(train_end + retrain_every, n_rows)))
+    return windows
+
+
+def rolling_robust_scalers(X, windows, train_window=0, quantile_range=(25.0, 75.0)):
+    """A fitted RobustScaler per window, from one rolling pass over ``X``.
+
+    ``train_window`` is the one the windows were built with (0 for all
+    earlier rows).
+
+    Median and quartiles are updated incrementally by pandas' rolling (or
+    expanding) quantiles instead of re-sorting every window; they match
+    ``RobustScaler().fit`` on the window up to rounding in the interpolation.
+    """
+    frame = pd.DataFrame(X)
+    rolling = frame.rolling(train_window, min_periods=1) if train_window else frame.expanding()
+    ends = np.array([end for _, end, _ in windows]) - 1
+    center = rolling.median().to_numpy()[ends]
+    low = rolling.quantile(quantile_range[0] / 100).to_numpy()[ends]
+    high = rolling.quantile(quantile_range[1] / 100).to_numpy()[ends]
+
+    scalers = []
+    for k in range(len(windows)):
+        scale = high[k] - low[k]
+        # RobustScaler treats a (near) zero spread as 1
+        scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+        scaler = RobustScaler(quantile_range=quantile_range)
+        scaler.center_, scaler.scale_, scaler.n_features_in_ = center[k], scale, X.shape[1]
+        scalers.append(scaler)
+    return scalers
+
+
+def grow_warm_start(predictor, add_trees, max_trees):
+    """Set up a warm-started predictor's forests for the next window's fit.
+
+    The random forest gets ``add_trees`` new trees and drops its oldest ones
+    so it never holds more than ``max_trees``. Boosting stages build on
+    each other and cannot be dropped, so once the boosted model would pass
+    ``max_trees`` it is refit from scratch at its initial size instead.
+    """
+    add_trees = min(add_trees, max_trees)
+    rf = predictor.models['rf']
+    keep = min(len(rf.estimators_), max_trees - add_trees)
+    rf.estimators_ = rf.estimators_[len(rf.estimators_) - keep:]
+    rf.set_params(warm_start=True, n_estimators=keep + add_trees)
+
+    gb = predictor.models['gb']
+    if gb.n_estimators + add_trees <= max_trees:
+        gb.set_params(warm_start=True, n_estimators=gb.n_estimators + add_trees)
+    else:
+        gb.set_params(warm_start=False, n_estimators=EnhancedPredictor().models['gb'].n_estimators)
+
+
+def _score_window(strategy, X_test, sentiment, sent_conf):
+    start = time.perf_counter()
+    scores = strategy.score(X_test, sentiment, sent_conf)
+    return scores, time.perf_counter() - start
+
+
+def fit_window(window, X, y, scaler, sentiment, sent_conf, rf_n_jobs=None, config=Config):
+    """Train a fresh ensemble on one window and score the rows that follow it"""
+    train_start, train_end, test_end = window
+    strategy = EnhancedStrategy(config)
+    strategy.predictor = EnhancedPredictor(rf_n_jobs=rf_n_jobs)
+    start = time.perf_counter()
+    strategy.predictor.fit(X[train_start:train_end], y[train_start:train_end], scaler=scaler)
+    train_s = time.perf_counter() - start
+    scores, predict_s = _score_window(strategy, X[train_end:test_end],
+                                      sentiment[train_end:test_end], sent_conf[train_end:test_end])
+    return scores, train_s, predict_s
+
+
+def walk_forward(features_df, feature_cols, train_window=None, min_train=None, retrain_every=None,
+                 warm_start=False, n_jobs=None, config=Config):
+    """Score ``features_df`` out of sample, retraining every ``retrain_every`` rows.
+
+    Each model is trained on the ``train_window`` rows before its block
+    (0 means all earlier rows) and scores only that block, so every
+    prediction comes from a model that never saw it. Windows are
+    independent and trained in parallel (``n_jobs``). Unset arguments come
+    from ``config`` (WF_TRAIN_WINDOW, WF_MIN_TRAIN, WF_RETRAIN_EVERY,
+    CV_N_JOBS).
+
+    With ``warm_start`` the windows are chained instead: the first one is
+    trained in full, later ones keep the previous forests/boosting stages
+    and add Config.WF_WARM_START_TREES trees fitted on the new window (the
+    Ridge model is refit), up to Config.WF_WARM_START_MAX_TREES per model
+    (see ``grow_warm_start``). The first window's scaling is kept so earlier
+    trees stay valid.
+
+    Returns ``(signals_df, report)``: the scored rows, shaped like
+    ``generate_signals`` output, and one row per window with its bounds and
+    training / inference time.
+    """
+    train_window = config.WF_TRAIN_WINDOW if train_window is None else train_window
+    windows = walk_forward_windows(len(features_df), train_window, min_train, retrain_every, config)
+    if not windows:
+        raise ValueError("Not enough rows for a walk-forward window")
+
+    X = features_df[feature_cols].to_numpy(dtype=np.float64)
+    y = features_df['target_next_return'].to_numpy(dtype=np.float64)
+    sentiment = features_df['sentiment'].to_numpy(dtype=np.float64)
+    sent_conf = features_df['confidence'].to_numpy(dtype=np.float64) \
+        if 'confidence' in features_df else np.full(len(X), 0.5)
+
+    start = time.perf_counter()
+    scalers = rolling_robust_scalers(X, windows, train_window)
+    scaler_s = time.perf_counter() - start
+
+    if warm_start:
+        results = []
+        strategy = EnhancedStrategy(config)
+        for k, (train_start, train_end, test_end) in enumerate(windows):
+            predictor = strategy.predictor
+            if k:
+                grow_warm_start(predictor, config.WF_WARM_START_TREES,
+                                config.WF_WARM_START_MAX_TREES)
+            start = time.perf_counter()
+            predictor.fit(X[train_start:train_end], y[train_start:train_end],
+                          scaler=predictor.scaler if k else scalers[0])
+            train_s = time.perf_counter() - start
+            scores, predict_s = _score_window(strategy, X[train_end:test_end],
+                                              sentiment[train_end:test_end],
+                                              sent_conf[train_end:test_end])
+            results.append((scores, train_s, predict_s))
+    else:
+        workers = min(effective_n_jobs(config.CV_N_JOBS if n_jobs is None else n_jobs), len(windows))
+        rf_n_jobs = max(1, (os.cpu_count() or 1) // workers)
+        results = Parallel(n_jobs=workers)(
+            delayed(fit_window)(window, X, y, scaler, sentiment, sent_conf, rf_n_jobs, config)
+            for window, scaler in zip(windows, scalers)
+        )
+
+    report = pd.DataFrame([
+        {
+            'train_start': features_df['date'].iloc[train_start],
+            'train_end': features_df['date'].iloc[train_end - 1],
+            'test_start': features_df['date'].iloc[train_end],
+            'test_end': features_df['date'].iloc[test_end - 1],
+            'train_rows': train_end - train_start,
+            'test_rows': test_end - train_end,
+            'train_s': train_s,
+            'predict_s': predict_s,
+        }
+        for (train_start, train_end, test_end), (_, train_s, predict_s) in zip(windows, results)
+    ])
+    report.attrs['scaler_s'] = scaler_s
+
+    signals_df = features_df.iloc[windows[0][1]:].copy()
+    for col in ['pred_next_return', 'pred_confidence', 'signal', 'final_score', 'position_size']:
+        signals_df[col] = np.concatenate([scores[col] for scores, _, _ in results])
+    return signals_df, report
+
+
+def main_walk_forward(ticker=Config.TARGET_TICKER, warm_start=False, config=Config, **kwargs):
+    """Walk-forward version of main_enhanced: retrain on a schedule, backtest the out-of-sample rows"""
+    market_df, sentiment_df, earnings_df = load_or_generate_data(ticker)
+    features_df = prepare_enhanced_features(market_df, sentiment_df, earnings_df)
+    feature_cols = select_feature_cols(features_df)
+
+    start = time.perf_counter()
+    signals_df, report = walk_forward(features_df, feature_cols, warm_start=warm_start,
+                                      config=config, **kwargs)
+    total_s = time.perf_counter() - start
+    print(report.to_string(index=False))
+    print(f"{len(report)} windows in {total_s:.2f}s (training {report['train_s'].sum():.2f}s, "
+          f"inference {report['predict_s'].sum():.3f}s, scaler statistics "
+          f"{report.attrs['scaler_s'] * 1000:.1f}ms)")
+
+    backtest_df, metrics = enhanced_backtest(signals_df, config)
+    for metric, value in metrics.items():
+        print(f"{metric.replace('_', ' ').title()}: {value:.4f}")
+    return signals_df, report, backtest_df, metrics
+
+
+if __name__ == "__main__":
+    main_walk_forward()
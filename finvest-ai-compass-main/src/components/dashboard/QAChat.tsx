@@ -5,6 +5,9 @@ import { Input } from "@/components/ui/input";
 import { useToast } from "@/components/ui/use-toast";
 import { Send, Upload, Link as LinkIcon } from "lucide-react";
 import { marked } from "marked";
+import { getSessionId } from "@/lib/session";
+import { waitForJob } from "@/lib/jobs";
+import { readEventStream } from "@/lib/sse";
 
 interface Message {
   role: "user" | "assistant";
@@ -15,6 +18,7 @@ interface DocData {
   name: string;
   type: string;
   content?: string;
+  chars?: number;
   source: "upload" | "url";
 }
 
@@ -79,10 +83,12 @@ export const QAChat = () => {
       const response = await fetch(`${API_URL}/process-document`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ text }),
+        body: JSON.stringify({ text, session_id: getSessionId() }),
       });
 
-      if (!response.ok) throw new Error("Failed to process document");
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.message || "Failed to process document");
+      await waitForJob(data.job_id);
       setIsProcessing(false);
     } catch (error) {
       console.error("Error processing document:", error);
@@ -95,10 +101,10 @@ export const QAChat = () => {
     }
   };
 
-  const addDoc = async (doc: DocData) => {
+  const addDoc = async (doc: DocData, ingest = true) => {
     const next = [doc, ...docs].slice(0, 6);
     setDocs(next);
-    if (doc.content) {
+    if (ingest && doc.content) {
       await processDocument(doc.content);
     }
   };
@@ -109,21 +115,35 @@ export const QAChat = () => {
       const ext = file.name.split(".").pop()?.toLowerCase();
       if (ext === "txt" || ext === "html" || ext === "htm" || ext === "pdf") {
         try {
-          let content = "";
           if (ext === "pdf") {
+            // The backend extracts and ingests the PDF in one call
             const formData = new FormData();
             formData.append("file", file);
+            formData.append("session_id", getSessionId());
             const response = await fetch(`${API_URL}/process-pdf`, {
               method: "POST",
               body: formData,
             });
             const data = await response.json();
-            content = data.text;
-          } else {
-            content = await file.text();
-            if (ext === "html" || ext === "htm") {
-              content = stripHtml(content);
-            }
+            if (!response.ok) throw new Error(data.message);
+            setIsProcessing(true);
+            const job = await waitForJob(data.job_id).finally(() =>
+              setIsProcessing(false)
+            );
+            await addDoc(
+              {
+                name: file.name,
+                type: file.type || "application/pdf",
+                chars: job.progress.characters as number,
+                source: "upload",
+              },
+              false
+            );
+            continue;
+          }
+          let content = await file.text();
+          if (ext === "html" || ext === "htm") {
+            content = stripHtml(content);
           }
           await addDoc({
             name: file.name,
@@ -184,28 +204,47 @@ export const QAChat = () => {
   const answer = async (q: string) => {
     try {
       setIsProcessing(true);
-      const response = await fetch(`${API_URL}/ask`, {
+      const response = await fetch(`${API_URL}/ask/stream`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
           question: q,
+          session_id: getSessionId(),
           ticker: currentTicker, // Include current ticker if available
         }),
       });
 
-      const data = await response.json();
-
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
+        const data = await response.json().catch(() => ({}));
         throw new Error(data.message || "Failed to get answer");
       }
 
+      // Render the answer token by token as it streams in
+      let streamed = "";
+      let streamError = "";
+      setMessages((m) => [...m, { role: "assistant", content: "" }]);
+      await readEventStream(response.body, (event, data) => {
+        if (event === "token") {
+          streamed += data.token;
+          const content = streamed;
+          setMessages((m) => [
+            ...m.slice(0, -1),
+            { role: "assistant", content },
+          ]);
+        } else if (event === "error") {
+          streamError = data.message;
+        }
+      });
+
       // Ensure proper markdown formatting for lists and sections
-      let formattedAnswer = data.answer
-        .replace(/^\s*[-*]\s+/gm, "* ") // Standardize list markers
-        .replace(/(\*\*[^*]+\*\*):/g, "$1:\n"); // Add newline after section headers
+      let formattedAnswer = streamError
+        ? `Error: ${streamError}`
+        : streamed
+            .replace(/^\s*[-*]\s+/gm, "* ") // Standardize list markers
+            .replace(/(\*\*[^*]+\*\*):/g, "$1:\n"); // Add newline after section headers
 
       setMessages((m) => [
-        ...m,
+        ...m.slice(0, -1),
         {
           role: "assistant",
           content: formattedAnswer,
@@ -10,11 +10,14 @@ import {
   FileSpreadsheet,
   FileLineChart,
 } from "lucide-react";
+import { getSessionId } from "@/lib/session";
+import { waitForJob } from "@/lib/jobs";
 
 export interface DocData {
   name: string;
   type: string;
   content?: string;
+  chars?: number;
   source: "upload" | "url";
 }
 
@@ -45,11 +48,13 @@ export const UploadIngestCard = ({ onDocsChange }: Props) => {
       const ext = file.name.split(".").pop()?.toLowerCase();
       if (ext === "txt" || ext === "html" || ext === "htm" || ext === "pdf") {
         try {
-          let content = "";
+          let content: string | undefined;
+          let chars: number | undefined;
           if (ext === "pdf") {
             // For PDF files, we'll need to send the file itself
             const formData = new FormData();
             formData.append("file", file);
+            formData.append("session_id", getSessionId());
             const response = await fetch(
               "http://localhost:5000/api/process-pdf",
               {
@@ -58,7 +63,9 @@ export const UploadIngestCard = ({ onDocsChange }: Props) => {
               }
             );
             const data = await response.json();
-            content = data.text;
+            if (!response.ok) throw new Error(data.message);
+            const job = await waitForJob(data.job_id);
+            chars = job.progress.characters as number;
           } else {
             content = await file.text();
             if (ext === "html" || ext === "htm") {
@@ -69,6 +76,7 @@ export const UploadIngestCard = ({ onDocsChange }: Props) => {
             name: file.name,
             type: file.type || "text/plain",
             content: content,
+            chars: chars ?? content?.length,
             source: "upload",
           });
         } catch (error) {
@@ -196,7 +204,9 @@ export const UploadIngestCard = ({ onDocsChange }: Props) => {
                 </div>
               </div>
               <span className="text-xs text-muted-foreground">
-                {d.content
+                {d.chars
+                  ? `${d.chars.toLocaleString()} chars`
+                  : d.content
                   ? `${d.content.length.toLocaleString()} chars`
                   : "Queued"}
               </span>
@@ -0,0 +1,30 @@
+const API_URL = "http://localhost:5000/api";
+
+export interface JobStatus {
+  job_id: string;
+  status: "queued" | "running" | "succeeded" | "failed" | "cancelled";
+  stage: string;
+  progress: Record<string, number | boolean>;
+  result?: any;
+  error?: string | null;
+}
+
+// Poll a background ingestion job until it finishes
+export const waitForJob = async (
+  jobId: string,
+  onProgress?: (job: JobStatus) => void,
+  intervalMs = 500
+): Promise<JobStatus> => {
+  for (;;) {
+    const res = await fetch(`${API_URL}/jobs/${jobId}`);
+    const data = await res.json();
+    if (!res.ok) throw new Error(data.message || "Failed to fetch job");
+    const job: JobStatus = data.job;
+    onProgress?.(job);
+    if (job.status === "succeeded") return job;
+    if (job.status === "failed" || job.status === "cancelled") {
+      throw new Error(job.error || `Job ${job.status}`);
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
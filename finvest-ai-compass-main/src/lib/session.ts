@@ -0,0 +1,11 @@
+const SESSION_KEY = "finvest-session-id";
+
+// Per-tab id so the backend keeps a separate knowledge base per user
+export const getSessionId = () => {
+  let id = sessionStorage.getItem(SESSION_KEY);
+  if (!id) {
+    id = crypto.randomUUID();
+    sessionStorage.setItem(SESSION_KEY, id);
+  }
+  return id;
+};